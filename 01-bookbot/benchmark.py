@@ -0,0 +1,136 @@
+import argparse
+import json
+import random
+import string
+import sys
+import time
+import tracemalloc
+
+from stats import CHAR_ENGINES, get_num_chars, get_num_words, get_numpy, sort_num_chars
+from words import WordStats
+
+ALPHABETS = {
+    "ascii": string.ascii_letters + ",.;'!?",
+    "latin1": string.ascii_letters + "àáâäçèéêëìíîïñòóôöùúûüÀÉÈÇÑÖÜß,.;'!?",
+    # common CJK unified ideographs plus CJK punctuation
+    "cjk": "".join(map(chr, range(0x4E00, 0x4E00 + 3000))) + "，。、！？",
+}
+
+def make_text(size, alphabet="ascii", seed=0):
+    # random "words" of the alphabet separated by whitespace, `size` characters long
+    rng = random.Random(seed)
+    letters = ALPHABETS[alphabet]
+    words = ["".join(rng.choices(letters, k=rng.randint(1, 10))) for _ in range(10000)]
+    block = "".join(word + rng.choice(" \n") for word in words)
+    return (block * (size // len(block) + 1))[:size]
+
+def get_strategies(top):
+    # name -> function taking the text, run in this order, plus the names of the
+    # sorts, whose throughput is in histogram entries rather than text
+    strategies = {"words": get_num_words}
+    for engine in CHAR_ENGINES:
+        if engine == "numpy" and get_numpy() is None:
+            continue
+        strategies[f"chars-{engine}"] = lambda text, engine=engine: get_num_chars(text, engine)
+    char_dict = {}
+    sorts = {"sort-all", f"sort-top{top}"}
+    strategies["sort-all"] = lambda text: sort_num_chars(char_dict)
+    strategies[f"sort-top{top}"] = lambda text: sort_num_chars(char_dict, top)
+    strategies["word-frequency"] = lambda text: WordStats().update(text)
+
+    def prepare(text):
+        # the sorts only use the histogram, build it once outside of the timings
+        char_dict.update(get_num_chars(text))
+        return len(char_dict)
+
+    return strategies, prepare, sorts
+
+def time_strategy(func, text, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def measure_peak_memory(func, text):
+    tracemalloc.start()
+    try:
+        func(text)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def run(size_mb, alphabets, repeat, top, memory):
+    results = {}
+    for alphabet in alphabets:
+        text = make_text(int(size_mb * 1024 * 1024), alphabet)
+        mb = len(text.encode("utf-8")) / (1024 * 1024)
+        strategies, prepare, sorts = get_strategies(top)
+        entries = prepare(text)
+        for name, func in strategies.items():
+            elapsed = time_strategy(func, text, repeat)
+            result = {"seconds": elapsed}
+            if name in sorts:
+                result["entries_per_s"] = entries / elapsed
+            else:
+                result["mb_per_s"] = mb / elapsed
+            if memory:
+                result["peak_bytes"] = measure_peak_memory(func, text)
+            results[f"{alphabet}/{name}"] = result
+            print_result(f"{alphabet}/{name}", result)
+    return results
+
+def print_result(name, result, baseline=None):
+    line = f"{name:>24}: {result['seconds']:8.3f}s"
+    if "mb_per_s" in result:
+        line += f" {result['mb_per_s']:9.1f} MB/s"
+    else:
+        line += f" {result['entries_per_s']:9.3g} entries/s"
+    if "peak_bytes" in result:
+        line += f" {result['peak_bytes'] / (1024 * 1024):8.1f} MB peak"
+    if baseline is not None:
+        line += f" {baseline['seconds'] / result['seconds']:6.2f}x vs baseline"
+    print(line)
+
+def compare(results, baseline, threshold):
+    # print each benchmark against the baseline and return the names that got slower
+    regressions = []
+    print(f"Compared to baseline (regression threshold {threshold:.0%}):")
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        print_result(name, result, baseline[name])
+        if result["seconds"] > baseline[name]["seconds"] * (1 + threshold):
+            regressions.append(name)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bookbot counting strategies on synthetic corpora")
+    parser.add_argument("--size-mb", type=float, default=100, help="length of each synthetic corpus in Mi characters (throughput is reported over its UTF-8 size)")
+    parser.add_argument("--alphabet", choices=ALPHABETS, nargs="+", default=list(ALPHABETS), help="alphabets to generate corpora from")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per strategy, the fastest is reported")
+    parser.add_argument("--top", type=int, default=10, help="N for the top-N sort")
+    parser.add_argument("--no-memory", action="store_true", help="skip the (slow) tracemalloc peak memory runs")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="slowdown vs baseline reported as a regression")
+    args = parser.parse_args()
+
+    print(f"Benchmarking on {args.size_mb} Mi characters per alphabet")
+    results = run(args.size_mb, args.alphabet, args.repeat, args.top, not args.no_memory)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"Regressions: {', '.join(regressions)}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+import codecs
+import glob
+import hashlib
+import json
+import mmap
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from cache import StatsCache
+from stats import DEFAULT_CHAR_ENGINE, BookStats, sort_num_chars
+
+CHUNK_SIZE = 1024 * 1024  # characters
+TAIL_SIZE = 4096  # bytes
+DEFAULT_TOP_WORDS = 10
+
+# Text is read as UTF-8 with newlines untranslated, so every read mode (including
+# --mmap, which decodes the raw bytes) sees the same characters, "\r" included.
+
+def get_book_text(filepath):
+    with open(filepath, encoding="utf-8", newline="") as f:
+        file_contents = f.read()
+    return file_contents
+
+def get_book_chunks(filepath, chunk_size=CHUNK_SIZE):
+    with open(filepath, encoding="utf-8", newline="") as f:
+        while chunk := f.read(chunk_size):
+            yield chunk
+
+def get_book_mmap_chunks(filepath, chunk_size=CHUNK_SIZE):
+    # ASCII chunks are yielded as raw bytes, only the non-ASCII ones are decoded
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    with open(filepath, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for start in range(0, len(mm), chunk_size):
+                chunk = mm[start:start + chunk_size]
+                pending, _ = decoder.getstate()
+                if not pending and chunk.isascii():
+                    yield chunk
+                else:
+                    yield decoder.decode(chunk)
+            yield decoder.decode(b"", final=True)
+
+def get_book_stats(filepath, stream=False, chunk_size=CHUNK_SIZE, engine=DEFAULT_CHAR_ENGINE, use_mmap=False,
+                   ngrams=(), capacity=None):
+    stats = BookStats(engine, ngrams, capacity)
+    if use_mmap:
+        for chunk in get_book_mmap_chunks(filepath, chunk_size):
+            stats.update(chunk)
+    elif stream:
+        for chunk in get_book_chunks(filepath, chunk_size):
+            stats.update(chunk)
+    else:
+        stats.update(get_book_text(filepath))
+    stats.finish()
+    return stats
+
+def get_tail_hash(f, offset):
+    # hash of the bytes just before offset, to check the file was only appended to since
+    start = max(0, offset - TAIL_SIZE)
+    f.seek(start)
+    return hashlib.sha256(f.read(offset - start)).hexdigest()
+
+def get_incremental_book_stats(filepath, cache, key, chunk_size=CHUNK_SIZE, engine=DEFAULT_CHAR_ENGINE,
+                               ngrams=(), capacity=None, **_):
+    # Resume from the checkpoint of the previous run and only scan the bytes appended
+    # since. The checkpoint holds the unfinished state (partial word, n-gram history),
+    # so the book can keep growing. Falls back to a full scan if the book was
+    # truncated or rewritten. Reads are always chunked bytes, the stream and use_mmap
+    # options of get_book_stats() are ignored.
+    stats = BookStats(engine, ngrams, capacity)
+    offset = 0
+    checkpoint = cache.get_checkpoint(filepath, key)
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    with open(filepath, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if checkpoint is not None:
+            last_offset, tail_hash, state = checkpoint
+            if last_offset <= size and get_tail_hash(f, last_offset) == tail_hash:
+                stats = BookStats.from_dict(state, engine)
+                offset = last_offset
+        f.seek(offset)
+        while chunk := f.read(chunk_size):
+            pending, _ = decoder.getstate()
+            stats.update(chunk if not pending and chunk.isascii() else decoder.decode(chunk))
+        # a character cut off by a write in progress is left for the next run
+        pending, _ = decoder.getstate()
+        offset = f.tell() - len(pending)
+        cache.put_checkpoint(filepath, offset, get_tail_hash(f, offset), stats.to_dict(), key)
+    # the checkpoint is already serialized, finishing the stats cannot change it
+    stats.finish()
+    return stats
+
+def get_cached_book_stats(filepath, cache_path=None, incremental=False, cache=None, **options):
+    # cache is an already open StatsCache to use instead of opening cache_path
+    if cache is None:
+        if cache_path is None:
+            if incremental:
+                raise ValueError("incremental runs keep their checkpoints in the cache")
+            return get_book_stats(filepath, **options)
+        with StatsCache(cache_path) as cache:
+            return get_cached_book_stats(filepath, incremental=incremental, cache=cache, **options)
+    # only the word statistics options change what is stored for a book
+    key = json.dumps([list(options.get("ngrams", ())), options.get("capacity")])
+    if incremental:
+        return get_incremental_book_stats(filepath, cache, key, **options)
+    result, digest = cache.get(filepath, key)
+    if result is not None:
+        return BookStats.from_dict(result, options.get("engine", DEFAULT_CHAR_ENGINE))
+    stats = get_book_stats(filepath, **options)
+    cache.put(filepath, stats.to_dict(), digest, key)
+    return stats
+
+def find_books(patterns):
+    # expand files, directories (recursively) and glob patterns into a sorted list of files
+    books = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for root, _, files in os.walk(pattern):
+                books.update(os.path.join(root, name) for name in files)
+        elif os.path.isfile(pattern):
+            books.add(pattern)
+        else:
+            books.update(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+    return sorted(books)
+
+# the cache connection of a pool worker, opened once by open_worker_cache and
+# used for every book the worker analyzes
+worker_cache = None
+
+def open_worker_cache(cache_path):
+    global worker_cache
+    if cache_path is not None:
+        worker_cache = StatsCache(cache_path, migrate=False)
+
+def try_get_book_stats(filepath, cache=None, **options):
+    # (stats, None), or (None, error message) for a book that cannot be read, e.g.
+    # a binary or non-UTF-8 file picked up from a directory, so it does not take
+    # the rest of a batch down with it
+    try:
+        return get_cached_book_stats(filepath, cache=cache or worker_cache, **options), None
+    except (OSError, UnicodeDecodeError, sqlite3.Error) as e:
+        return None, f"{type(e).__name__}: {e}"
+
+def get_all_book_stats(filepaths, jobs=None, cache_path=None, **options):
+    # analyze books over a process pool, (stats, error) pairs in the same order as filepaths;
+    # the cache is migrated once here and each process then keeps one connection to it
+    if len(filepaths) <= 1 or jobs == 1:
+        if cache_path is None:
+            return [try_get_book_stats(path, **options) for path in filepaths]
+        with StatsCache(cache_path) as cache:
+            return [try_get_book_stats(path, cache=cache, **options) for path in filepaths]
+    if cache_path is not None:
+        StatsCache(cache_path).close()
+    jobs = jobs or os.cpu_count()
+    # hand out books in batches to keep the pickling overhead low for many small books
+    chunksize = max(1, len(filepaths) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=open_worker_cache, initargs=(cache_path,)) as executor:
+        return list(executor.map(partial(try_get_book_stats, **options), filepaths, chunksize=chunksize))
+
+def get_report(stats, path=None, top=None, alpha_only=True):
+    # plain dicts and lists only, ready for json.dumps
+    report = {
+        "path": path,
+        "num_words": stats.num_words,
+        "chars": [{"char": char, "num": num} for char, num in sort_num_chars(stats.num_chars, top, alpha_only)],
+        "ngrams": [],
+    }
+    for word_stats in stats.word_stats:
+        report["ngrams"].append({
+            "n": word_stats.n,
+            "approx": word_stats.capacity is not None,
+            "counts": [{"words": words, "num": num} for words, num in word_stats.most_common(top or DEFAULT_TOP_WORDS)],
+        })
+    return report
+
+def analyze_book(filepath, top=None, alpha_only=True, **options):
+    # report of a single book, options are those of get_book_stats plus cache_path
+    stats = get_cached_book_stats(filepath, **options)
+    return get_report(stats, filepath, top, alpha_only)
+
+def analyze_books(patterns, jobs=None, top=None, alpha_only=True, **options):
+    # reports of every book matching the patterns and of all of them combined,
+    # books that could not be read are listed under errors and left out of the total
+    books = find_books(patterns)
+    total = BookStats(options.get("engine", DEFAULT_CHAR_ENGINE), options.get("ngrams", ()), options.get("capacity"))
+    reports = []
+    errors = []
+    for book, (stats, error) in zip(books, get_all_book_stats(books, jobs, **options)):
+        if error is not None:
+            errors.append({"path": book, "error": error})
+            continue
+        total.merge(stats)
+        reports.append(get_report(stats, book, top, alpha_only))
+    return {
+        "books": reports,
+        "total": get_report(total, None, top, alpha_only),
+        "errors": errors,
+    }
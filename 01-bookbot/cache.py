@@ -0,0 +1,139 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "bookbot", "stats.sqlite")
+DEFAULT_MAX_ENTRIES = 100_000
+# bump when the table layout or the stored results change
+SCHEMA_VERSION = 5
+
+def hash_file(filepath, block_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        while block := f.read(block_size):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class StatsCache:
+    # On-disk cache of per-book results keyed by path, size, mtime and content hash.
+    # A book whose size and mtime are unchanged is served without reading it,
+    # otherwise it is hashed and served if the content is unchanged (e.g. touched
+    # or copied files). Least recently used entries are evicted past max_entries.
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=DEFAULT_MAX_ENTRIES, migrate=True):
+        self.path = path
+        self.max_entries = max_entries
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # several worker processes share the database, wait for each other's writes
+        self.db = sqlite3.connect(path, timeout=60)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        # workers pass migrate=False, the parent already migrated before starting them
+        if migrate:
+            self.migrate()
+
+    def migrate(self):
+        # create the tables, or drop and recreate them when SCHEMA_VERSION changed;
+        # under a write lock from the start, so a process opening the cache at the
+        # same time cannot drop the tables right after another one created them
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            if self.db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                self.db.execute("DROP TABLE IF EXISTS books")
+                self.db.execute("DROP TABLE IF EXISTS checkpoints")
+                self.db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            # options holds whatever changes the result for the same book, e.g. n-gram sizes
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS books ("
+                "path TEXT, options TEXT, size INTEGER, mtime_ns INTEGER, hash TEXT, "
+                "result TEXT, last_used REAL, PRIMARY KEY (path, options))"
+            )
+            self.db.execute("CREATE INDEX IF NOT EXISTS books_hash ON books (hash, options)")
+            # where incremental runs over append-only books stopped, see bookbot.get_incremental_book_stats
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS checkpoints ("
+                "path TEXT, options TEXT, offset INTEGER, tail_hash TEXT, "
+                "state TEXT, last_used REAL, PRIMARY KEY (path, options))"
+            )
+        except BaseException:
+            self.db.rollback()
+            raise
+        self.db.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.db.close()
+
+    def get(self, filepath, options=""):
+        # returns (result, hash) where result is None on a miss,
+        # hash is computed lazily and passed back so put() does not hash twice
+        filepath = os.path.abspath(filepath)
+        st = os.stat(filepath)
+        row = self.db.execute(
+            "SELECT size, mtime_ns, result FROM books WHERE path = ? AND options = ?",
+            (filepath, options),
+        ).fetchone()
+        if row is not None and row[:2] == (st.st_size, st.st_mtime_ns):
+            self.touch(filepath, options)
+            return json.loads(row[2]), None
+
+        digest = hash_file(filepath)
+        row = self.db.execute(
+            "SELECT result FROM books WHERE hash = ? AND options = ? AND size = ?",
+            (digest, options, st.st_size),
+        ).fetchone()
+        if row is None:
+            return None, digest
+        result = json.loads(row[0])
+        self.put(filepath, result, digest, options)
+        return result, digest
+
+    def put(self, filepath, result, digest=None, options=""):
+        filepath = os.path.abspath(filepath)
+        st = os.stat(filepath)
+        if digest is None:
+            digest = hash_file(filepath)
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO books VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (filepath, options, st.st_size, st.st_mtime_ns, digest, json.dumps(result), time.time()),
+            )
+
+    def touch(self, filepath, options=""):
+        with self.db:
+            self.db.execute(
+                "UPDATE books SET last_used = ? WHERE path = ? AND options = ?",
+                (time.time(), filepath, options),
+            )
+
+    def get_checkpoint(self, filepath, options=""):
+        # returns (offset, tail_hash, state) or None if the book was never checkpointed
+        row = self.db.execute(
+            "SELECT offset, tail_hash, state FROM checkpoints WHERE path = ? AND options = ?",
+            (os.path.abspath(filepath), options),
+        ).fetchone()
+        if row is None:
+            return None
+        return row[0], row[1], json.loads(row[2])
+
+    def put_checkpoint(self, filepath, offset, tail_hash, state, options=""):
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?)",
+                (os.path.abspath(filepath), options, offset, tail_hash, json.dumps(state), time.time()),
+            )
+
+    def evict(self):
+        with self.db:
+            for table in ("books", "checkpoints"):
+                self.db.execute(
+                    f"DELETE FROM {table} WHERE rowid NOT IN "
+                    f"(SELECT rowid FROM {table} ORDER BY last_used DESC LIMIT ?)",
+                    (self.max_entries,),
+                )
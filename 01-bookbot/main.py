@@ -1,27 +1,106 @@
+import argparse
+import csv
+import json
 import sys
-from stats import get_num_words, get_num_chars, sort_num_chars
+from bookbot import CHUNK_SIZE, analyze_books
+from cache import DEFAULT_CACHE_PATH, DEFAULT_MAX_ENTRIES, StatsCache
+from stats import CHAR_ENGINES, DEFAULT_CHAR_ENGINE
 
-def get_book_text(filepath):
-    with open(filepath) as f:
-        file_contents = f.read()
-    return file_contents
+NGRAM_NAMES = {1: "Word", 2: "Bigram", 3: "Trigram"}
 
-def main():
-    if len(sys.argv) != 2:
-        print("Usage: python3 main.py <path_to_book>")
-        sys.exit(1)
-
-    result = get_book_text(sys.argv[1])
-    list_chars = sort_num_chars(get_num_chars(result))
-    
+def print_report(title, report):
     print("============ BOOKBOT ============")
-    print(f"Analyzing book found at {sys.argv[1]}...")
+    print(title)
     print("----------- Word Count ----------")
-    print(f"Found {get_num_words(result)} total words")
+    print(f"Found {report['num_words']} total words")
     print("--------- Character Count -------")
-    for item in list_chars:
-        if item["char"].isalpha():
-            print(f"{item['char']}: {item['num']}")
+    for item in report["chars"]:
+        print(f"{item['char']}: {item['num']}")
+    for ngram in report["ngrams"]:
+        name = NGRAM_NAMES.get(ngram["n"], f"{ngram['n']}-gram")
+        approx = " (approx)" if ngram["approx"] else ""
+        print(f"--------- {name} Frequency{approx} -------")
+        for item in ngram["counts"]:
+            print(f"{item['words']}: {item['num']}")
     print("============= END ===============")
 
-main()
+def print_text(result, summary_only=False):
+    books = result["books"]
+    if len(books) == 1:
+        print_report(f"Analyzing book found at {books[0]['path']}...", books[0])
+        return
+    if not summary_only:
+        for report in books:
+            print_report(f"Analyzing book found at {report['path']}...", report)
+    print_report(f"Aggregate of {len(books)} books...", result["total"])
+
+def print_csv(result, summary_only=False):
+    # one row per count, the aggregate rows have an empty path
+    reports = [result["total"]] if summary_only else result["books"] + [result["total"]]
+    writer = csv.writer(sys.stdout)
+    writer.writerow(["path", "metric", "item", "count"])
+    for report in reports:
+        path = report["path"] or ""
+        writer.writerow([path, "words", "", report["num_words"]])
+        for item in report["chars"]:
+            writer.writerow([path, "char", item["char"], item["num"]])
+        for ngram in report["ngrams"]:
+            for item in ngram["counts"]:
+                writer.writerow([path, f"ngram{ngram['n']}", item["words"], item["num"]])
+
+def print_json(result, summary_only=False):
+    if summary_only:
+        result = {"total": result["total"], "errors": result["errors"]}
+    json.dump(result, sys.stdout, ensure_ascii=False, indent=2)
+    print()
+
+FORMATS = {"text": print_text, "json": print_json, "csv": print_csv}
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("paths", nargs="+", help="book files, directories or glob patterns")
+    parser.add_argument("--stream", action="store_true", help="read the book in fixed-size chunks instead of all at once")
+    parser.add_argument("--mmap", action="store_true", help="scan the memory-mapped file as bytes, decoding only non-ASCII chunks")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="characters (bytes with --mmap) per chunk in streaming mode")
+    parser.add_argument("--engine", choices=CHAR_ENGINES, default=DEFAULT_CHAR_ENGINE, help="character counting engine")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes for multiple books (default: all cores)")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH, help="path of the per-book results cache")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_MAX_ENTRIES, help="books kept in the cache, least recently used are evicted")
+    parser.add_argument("--incremental", action="store_true", help="only scan what was appended to each book since the last incremental run")
+    parser.add_argument("--no-cache", action="store_true", help="neither read nor update the results cache")
+    parser.add_argument("--top", type=int, default=None, help="only report the N most frequent characters")
+    parser.add_argument("--all-chars", action="store_true", help="report every character, not just letters")
+    parser.add_argument("--ngrams", type=int, nargs="+", default=(), metavar="N", help="also count word n-grams of these sizes, 1 for single words")
+    parser.add_argument("--approx", type=int, default=None, metavar="K", help="count only about the K most frequent n-grams in bounded memory")
+    parser.add_argument("--format", choices=FORMATS, default="text", help="output format")
+    parser.add_argument("--summary-only", action="store_true", help="only print the aggregate report for multiple books")
+    args = parser.parse_args()
+    if any(n < 1 for n in args.ngrams):
+        parser.error("--ngrams sizes must be at least 1")
+    if args.approx is not None and args.approx < 1:
+        parser.error("--approx must be at least 1")
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+    if args.incremental and args.no_cache:
+        parser.error("--incremental keeps its checkpoints in the cache and cannot be used with --no-cache")
+    if args.incremental and (args.stream or args.mmap):
+        parser.error("--incremental always scans the appended bytes in chunks, drop --stream/--mmap")
+
+    cache_path = None if args.no_cache else args.cache
+    result = analyze_books(
+        args.paths, args.jobs, args.top, not args.all_chars, cache_path=cache_path,
+        stream=args.stream, chunk_size=args.chunk_size, engine=args.engine, use_mmap=args.mmap,
+        ngrams=args.ngrams, capacity=args.approx, incremental=args.incremental,
+    )
+    for error in result["errors"]:
+        print(f"Skipping {error['path']}: {error['error']}", file=sys.stderr)
+    if not result["books"]:
+        parser.error("no books could be read" if result["errors"] else "no books found")
+    if cache_path is not None:
+        with StatsCache(cache_path, args.cache_size) as cache:
+            cache.evict()
+
+    FORMATS[args.format](result, args.summary_only)
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,34 @@
+import heapq
+from collections import Counter
+from functools import cache
+
+from words import WordStats
+
+@cache
+def get_numpy():
+    # numpy is optional and slow to import, only load it when an engine needs it
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+# bytes.split() does not treat these ASCII separators as whitespace, str.split() does
+ASCII_SEPARATORS = bytes.maketrans(b"\x1c\x1d\x1e\x1f", b"    ")
+
+def is_space(char):
+    if isinstance(char, bytes):
+        char = char.decode("ascii")
+    return char.isspace()
+
 def get_num_words(text):
+    if isinstance(text, bytes):
+        text = text.translate(ASCII_SEPARATORS)
     return len(text.split())
 
-def get_num_chars(text):
-    text = text.lower()
+# The engines count characters as they are, get_num_chars() lowercases the result
+
+def count_chars_dict(text):
     result = {}
     for char in text:
         if char in result:
@@ -11,12 +37,141 @@ def get_num_chars(text):
             result[char] = 1
     return result
 
-def sort_on(dict):
-    return dict["num"]
+def count_chars_counter(text):
+    # same result (and key order) as the dict loop, but counted in C
+    return Counter(text)
+
+# above this many distinct characters one scan per character loses to Counter
+COUNT_MAX_DISTINCT = 64
 
-def sort_num_chars(char_dict):
-    result = []
+def count_chars_count(text):
+    # one C-level count scan per distinct character, in code point order so ties
+    # sort the same in every run (iterating a set of str depends on hash seeding)
+    if text.isascii():
+        # ASCII text is counted as bytes, which is cheaper than str
+        data = text.encode("ascii")
+        return {chr(byte): data.count(byte) for byte in sorted(set(data))}
+    chars = set(text)
+    if len(chars) > COUNT_MAX_DISTINCT:
+        return count_chars_counter(text)
+    return {char: text.count(char) for char in sorted(chars)}
+
+def count_chars_numpy(text):
+    np = get_numpy()
+    if np is None:
+        raise ValueError("the numpy engine requires numpy to be installed")
+    code_points = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    counts = np.bincount(code_points)
+    return {chr(i): int(counts[i]) for i in np.flatnonzero(counts)}
+
+CHAR_ENGINES = {
+    "dict": count_chars_dict,
+    "counter": count_chars_counter,
+    "count": count_chars_count,
+    "numpy": count_chars_numpy,
+}
+DEFAULT_CHAR_ENGINE = "counter"
+
+def count_ascii_bytes(data, engine=DEFAULT_CHAR_ENGINE):
+    # histogram of raw ASCII bytes without decoding them into a str
+    np = get_numpy() if engine == "numpy" else None
+    if np is not None:
+        counts = np.bincount(np.frombuffer(data, dtype=np.uint8))
+        return {chr(i): int(counts[i]) for i in np.flatnonzero(counts)}
+    return {chr(byte): data.count(byte) for byte in sorted(set(data))}
+
+def fold_case(char_dict):
+    # lowercase the counted characters one at a time: unlike str.lower() on the text
+    # this ignores context (Greek final sigma), so counts do not depend on where
+    # a streamed text is split into chunks
+    result = {}
     for char, num in char_dict.items():
-        result.append({"char": char, "num": num})
-    result.sort(reverse=True, key=sort_on)
+        for lower in char.lower():
+            if lower in result:
+                result[lower] += num
+            else:
+                result[lower] = num
     return result
+
+def get_num_chars(text, engine=DEFAULT_CHAR_ENGINE):
+    # lowercase character histogram of a str, or of bytes holding only ASCII
+    if engine not in CHAR_ENGINES:
+        raise ValueError(f"unknown character counting engine: {engine}")
+    if isinstance(text, bytes):
+        return fold_case(count_ascii_bytes(text, engine))
+    return fold_case(CHAR_ENGINES[engine](text))
+
+def merge_num_chars(result, char_dict):
+    for char, num in char_dict.items():
+        if char in result:
+            result[char] += num
+        else:
+            result[char] = num
+    return result
+
+def sort_on(item):
+    return item[1]
+
+def sort_num_chars(char_dict, top=None, alpha_only=False):
+    # (char, num) pairs, most frequent first, ties keep the order of char_dict
+    items = char_dict.items()
+    if alpha_only:
+        items = [item for item in items if item[0].isalpha()]
+    if top is not None:
+        return heapq.nlargest(top, items, key=sort_on)
+    return sorted(items, reverse=True, key=sort_on)
+
+
+class BookStats:
+    # Running word and character counts over a text fed in chunks,
+    # either str or bytes holding only ASCII characters
+    # with ngrams, also keeps a WordStats per n-gram size
+    def __init__(self, engine=DEFAULT_CHAR_ENGINE, ngrams=(), capacity=None):
+        self.engine = engine
+        self.num_words = 0
+        self.num_chars = {}
+        # whether the last chunk ended in the middle of a word
+        self.in_word = False
+        self.word_stats = [WordStats(n, capacity) for n in ngrams]
+
+    def update(self, chunk):
+        if not chunk:
+            return
+        self.num_words += get_num_words(chunk)
+        if self.in_word and not is_space(chunk[:1]):
+            # first word of this chunk is the tail of the previous chunk's last word
+            self.num_words -= 1
+        self.in_word = not is_space(chunk[-1:])
+        merge_num_chars(self.num_chars, get_num_chars(chunk, self.engine))
+        for word_stats in self.word_stats:
+            word_stats.update(chunk)
+
+    def finish(self):
+        # call once the whole text has been fed
+        for word_stats in self.word_stats:
+            word_stats.finish()
+
+    def to_dict(self):
+        return {
+            "num_words": self.num_words,
+            "num_chars": self.num_chars,
+            "in_word": self.in_word,
+            "word_stats": [word_stats.to_dict() for word_stats in self.word_stats],
+        }
+
+    @classmethod
+    def from_dict(cls, data, engine=DEFAULT_CHAR_ENGINE):
+        stats = cls(engine)
+        stats.num_words = data["num_words"]
+        stats.num_chars = dict(data["num_chars"])
+        stats.in_word = data["in_word"]
+        stats.word_stats = [WordStats.from_dict(word_stats) for word_stats in data["word_stats"]]
+        return stats
+
+    def merge(self, other):
+        # fold in the counts of a separate text, e.g. another book
+        self.num_words += other.num_words
+        merge_num_chars(self.num_chars, other.num_chars)
+        for word_stats, other_word_stats in zip(self.word_stats, other.word_stats):
+            word_stats.merge(other_word_stats)
+        return self
@@ -0,0 +1,141 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from bookbot import get_all_book_stats, get_book_stats, get_cached_book_stats, try_get_book_stats
+from stats import CHAR_ENGINES, get_numpy
+from words import WordStats
+
+TEXT = (
+    "The quick brown fox -- jumps over the lazy dog.\n"
+    "ΟΔΟΣ ΣΟΦΟΣ, don't stop!  Straße\tnaïve café\n\n"
+    "the fox, the dog; THE END\n"
+)
+NGRAMS = (1, 2, 3)
+
+
+def summary(stats):
+    # everything a report is built from, comparable between runs
+    return (
+        stats.num_words,
+        stats.num_chars,
+        [dict(word_stats.counts.items()) for word_stats in stats.word_stats],
+    )
+
+
+class Tests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "book.txt")
+        self.cache_path = os.path.join(self.tmp.name, "cache.sqlite")
+        self.write(TEXT.encode("utf-8"), "wb")
+
+    def write(self, data, mode="ab"):
+        with open(self.path, mode) as f:
+            f.write(data)
+
+    def full_scan(self):
+        return summary(get_book_stats(self.path, ngrams=NGRAMS))
+
+    def incremental(self, chunk_size=7):
+        return summary(get_cached_book_stats(
+            self.path, self.cache_path, incremental=True, chunk_size=chunk_size, ngrams=NGRAMS,
+        ))
+
+    def test_stream_chunk_boundaries(self):
+        # words, n-grams and case folding must not depend on where chunks end
+        expected = self.full_scan()
+        for chunk_size in range(1, 12):
+            self.assertEqual(
+                summary(get_book_stats(self.path, stream=True, chunk_size=chunk_size, ngrams=NGRAMS)),
+                expected,
+            )
+
+    def test_mmap_chunk_boundaries(self):
+        expected = self.full_scan()
+        for chunk_size in range(1, 12):
+            self.assertEqual(
+                summary(get_book_stats(self.path, use_mmap=True, chunk_size=chunk_size, ngrams=NGRAMS)),
+                expected,
+            )
+
+    def test_crlf_read_modes_agree(self):
+        self.write(TEXT.replace("\n", "\r\n").encode("utf-8"), "wb")
+        expected = self.full_scan()
+        self.assertEqual(expected[1]["\r"], TEXT.count("\n"))
+        self.assertEqual(summary(get_book_stats(self.path, stream=True, chunk_size=3, ngrams=NGRAMS)), expected)
+        self.assertEqual(summary(get_book_stats(self.path, use_mmap=True, chunk_size=3, ngrams=NGRAMS)), expected)
+        self.assertEqual(self.incremental(), expected)
+
+    def test_engines_agree(self):
+        expected = self.full_scan()
+        for engine in CHAR_ENGINES:
+            if engine == "numpy" and get_numpy() is None:
+                continue
+            self.assertEqual(
+                summary(get_book_stats(self.path, stream=True, chunk_size=5, engine=engine, ngrams=NGRAMS)),
+                expected,
+            )
+
+    def test_incremental_appends(self):
+        self.assertEqual(self.incremental(), self.full_scan())
+        # ends in the middle of a word, which the next write finishes
+        for data in ["more wor", "ds and the fox", "\n", "", "ΣΟΦ", "ΟΣ the end\n"]:
+            self.write(data.encode("utf-8"))
+            self.assertEqual(self.incremental(), self.full_scan())
+
+    def test_incremental_partial_character(self):
+        self.incremental()
+        data = " café Σ".encode("utf-8")
+        # a write cut off in the middle of the two bytes of "é"
+        self.write(data[:5])
+        self.incremental()
+        self.write(data[5:])
+        self.assertEqual(self.incremental(), self.full_scan())
+
+    def test_incremental_truncated(self):
+        self.incremental()
+        self.write("a shorter book\n".encode("utf-8"), "wb")
+        self.assertEqual(self.incremental(), self.full_scan())
+
+    def test_incremental_rewritten(self):
+        self.incremental()
+        # same length or longer, but the already scanned part changed
+        self.write(TEXT.upper().encode("utf-8") + b"and more\n", "wb")
+        self.assertEqual(self.incremental(), self.full_scan())
+
+
+    def test_outdated_cache_parallel(self):
+        self.incremental()
+        db = sqlite3.connect(self.cache_path)
+        db.execute("PRAGMA user_version = 0")
+        db.commit()
+        db.close()
+        # workers must find the tables the migration recreated
+        results = get_all_book_stats([self.path] * 8, jobs=4, cache_path=self.cache_path, ngrams=NGRAMS)
+        for stats, error in results:
+            self.assertIsNone(error)
+            self.assertEqual(summary(stats), self.full_scan())
+
+    def test_unreadable_book(self):
+        self.write(b"\xff\xfe\x00binary", "wb")
+        stats, error = try_get_book_stats(self.path)
+        self.assertIsNone(stats)
+        self.assertIn("UnicodeDecodeError", error)
+
+    def test_approx_merge_never_undercounts(self):
+        a = WordStats(capacity=2)
+        a.update("x x x y")
+        a.finish()
+        b = WordStats(capacity=2)
+        b.update("q q q r r r x")
+        b.finish()
+        counts = dict(a.merge(b).most_common())
+        self.assertGreaterEqual(counts.get("x", a.counts.floor), 4)
+        self.assertGreaterEqual(counts.get("q", a.counts.floor), 3)
+        self.assertGreaterEqual(counts.get("r", a.counts.floor), 3)
+
+if __name__ == "__main__":
+    unittest.main()
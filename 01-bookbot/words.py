@@ -0,0 +1,138 @@
+import heapq
+import string
+import sys
+from collections import Counter
+
+# stripped from both ends of a word, so "don't" stays one word but "end." becomes "end"
+PUNCTUATION = string.punctuation + "“”‘’«»—–"
+
+def sort_on(item):
+    return item[1]
+
+def get_words(text):
+    # lowercase words with surrounding punctuation removed, interned so repeated
+    # words (and the n-grams built from them) share one string object
+    words = []
+    for word in text.lower().split():
+        word = word.strip(PUNCTUATION)
+        if word:
+            words.append(sys.intern(word))
+    return words
+
+
+class SpaceSaving:
+    # Approximate counts of the most frequent items in bounded memory.
+    # At most `capacity` items are tracked. Counts are merged in batches, and an
+    # item that was dropped (or never seen) starts from `floor`, the largest count
+    # dropped so far, so estimates never undercount and overcount by at most floor.
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.counts = {}
+        self.floor = 0
+
+    def update(self, counts):
+        for item, num in counts.items():
+            self.counts[item] = self.counts.get(item, self.floor) + num
+        self.prune()
+
+    def merge(self, other):
+        # combine with the summary of another text: an item only one side tracks
+        # may have been dropped by the other, so it gets the other side's floor
+        counts = {item: num + other.counts.get(item, other.floor) for item, num in self.counts.items()}
+        for item, num in other.counts.items():
+            if item not in counts:
+                counts[item] = self.floor + num
+        self.counts = counts
+        self.floor += other.floor
+        self.prune()
+
+    def prune(self):
+        if len(self.counts) > self.capacity:
+            kept = heapq.nlargest(self.capacity + 1, self.counts.items(), key=sort_on)
+            self.floor = max(self.floor, kept.pop()[1])
+            self.counts = dict(kept)
+
+    def items(self):
+        return self.counts.items()
+
+    def most_common(self, n=None):
+        if n is None:
+            return sorted(self.counts.items(), reverse=True, key=sort_on)
+        return heapq.nlargest(n, self.counts.items(), key=sort_on)
+
+
+class WordStats:
+    # Running word (n=1) or n-gram frequencies over a text fed in chunks.
+    # Counting is exact unless a capacity is given, then it uses SpaceSaving.
+    # N-grams are stored as their words joined by a single space.
+    def __init__(self, n=1, capacity=None):
+        if n < 1:
+            raise ValueError("n-gram size must be at least 1")
+        self.n = n
+        self.capacity = capacity
+        self.counts = Counter() if capacity is None else SpaceSaving(capacity)
+        # unfinished word at the end of the last chunk
+        self.partial = ""
+        # last n - 1 words, so n-grams can span chunks
+        self.history = []
+
+    def update(self, chunk):
+        if isinstance(chunk, bytes):
+            chunk = chunk.decode("ascii")
+        if not chunk:
+            return
+        text = self.partial + chunk
+        words = text.split()
+        if words and not text[-1].isspace():
+            self.partial = words.pop()
+        else:
+            self.partial = ""
+        self.add_words(" ".join(words))
+
+    def finish(self):
+        # count the last word, call once the whole text has been fed
+        self.add_words(self.partial)
+        self.partial = ""
+
+    def add_words(self, text):
+        words = self.history + get_words(text)
+        if self.n == 1:
+            grams = words
+        else:
+            grams = map(" ".join, zip(*(words[i:] for i in range(self.n))))
+            self.history = words[len(words) - self.n + 1:]
+        self.counts.update(Counter(grams))
+
+    def most_common(self, n=None):
+        return self.counts.most_common(n)
+
+    def merge(self, other):
+        if isinstance(self.counts, SpaceSaving) and isinstance(other.counts, SpaceSaving):
+            self.counts.merge(other.counts)
+        else:
+            self.counts.update(dict(other.counts.items()))
+        return self
+
+    def to_dict(self):
+        data = {
+            "n": self.n,
+            "capacity": self.capacity,
+            "counts": dict(self.counts.items()),
+            "partial": self.partial,
+            "history": self.history,
+        }
+        if self.capacity is not None:
+            data["floor"] = self.counts.floor
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls(data["n"], data["capacity"])
+        if stats.capacity is None:
+            stats.counts.update(data["counts"])
+        else:
+            stats.counts.counts = dict(data["counts"])
+            stats.counts.floor = data["floor"]
+        stats.partial = data["partial"]
+        stats.history = [sys.intern(word) for word in data["history"]]
+        return stats
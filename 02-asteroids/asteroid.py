@@ -5,27 +5,33 @@ from circleshape import CircleShape
 from constants import ASTEROID_MIN_RADIUS
 
 class Asteroid(CircleShape):
+    # the random module, or a seeded random.Random for reproducible runs
+    rng = random
+
     def __init__(self, x, y, radius):
         super().__init__(x, y, radius)
 
-    def draw(self, screen):
-        pygame.draw.circle(screen, "white", self.position, self.radius, width=2)
+    def draw(self, screen, alpha=1):
+        pygame.draw.circle(screen, "white", self.interpolated_position(alpha), self.radius, width=2)
 
     def update(self, dt):
-        self.position += self.velocity * dt
+        # array backed bodies are integrated all at once by the physics backend
+        if self.slot is None:
+            self.position += self.velocity * dt
 
     def split(self):
         self.kill()
         if self.radius <= ASTEROID_MIN_RADIUS:
             return
         else:
-            random_angle = random.uniform(20, 50)
+            random_angle = self.rng.uniform(20, 50)
             new_velo1 = self.velocity.rotate(random_angle)
             new_velo2 = self.velocity.rotate(-random_angle)
             new_radius = self.radius - ASTEROID_MIN_RADIUS
+            x, y = self.position
 
-            new_aste1 = Asteroid(self.position.x, self.position.y, new_radius)
+            new_aste1 = Asteroid.create(x, y, new_radius)
             new_aste1.velocity = new_velo1 * 1.2
-            new_aste2 = Asteroid(self.position.x, self.position.y, new_radius)
+            new_aste2 = Asteroid.create(x, y, new_radius)
             new_aste2.velocity = new_velo2 * 1.2
 
@@ -5,6 +5,12 @@ from constants import *
 
 
 class AsteroidField(pygame.sprite.Sprite):
+    # the random module, or a seeded random.Random for reproducible runs
+    rng = random
+    # replay.Recorder to log spawns to, or replay.Replay to take them from instead of rng
+    recorder = None
+    playback = None
+
     edges = [
         [
             pygame.Vector2(1, 0),
@@ -33,19 +39,26 @@ class AsteroidField(pygame.sprite.Sprite):
         self.spawn_timer = 0.0
 
     def spawn(self, radius, position, velocity):
-        asteroid = Asteroid(position.x, position.y, radius)
+        asteroid = Asteroid.create(position.x, position.y, radius)
         asteroid.velocity = velocity
+        if self.recorder is not None:
+            self.recorder.spawned(radius, position, velocity)
 
     def update(self, dt):
+        if self.playback is not None:
+            for radius, position, velocity in self.playback.spawns():
+                self.spawn(radius, position, pygame.Vector2(velocity))
+            return
+
         self.spawn_timer += dt
         if self.spawn_timer > ASTEROID_SPAWN_RATE:
             self.spawn_timer = 0
 
             # spawn a new asteroid at a random edge
-            edge = random.choice(self.edges)
-            speed = random.randint(40, 100)
+            edge = self.rng.choice(self.edges)
+            speed = self.rng.randint(40, 100)
             velocity = edge[0] * speed
-            velocity = velocity.rotate(random.randint(-30, 30))
-            position = edge[1](random.uniform(0, 1))
-            kind = random.randint(1, ASTEROID_KINDS)
+            velocity = velocity.rotate(self.rng.randint(-30, 30))
+            position = edge[1](self.rng.uniform(0, 1))
+            kind = self.rng.randint(1, ASTEROID_KINDS)
             self.spawn(ASTEROID_MIN_RADIUS * kind, position, velocity)
@@ -0,0 +1,87 @@
+import argparse
+import random
+import time
+
+import pygame
+
+from asteroid import Asteroid
+from collision import BROADPHASES
+from constants import ASTEROID_MIN_RADIUS, ASTEROID_KINDS, SCREEN_WIDTH, SCREEN_HEIGHT
+from player import Shot
+
+
+def make_objects(num_asteroids, num_shots, seed=0):
+    # asteroids and shots scattered over the screen with random velocities, outside
+    # of any sprite group so the benchmark owns their movement
+    rng = random.Random(seed)
+    asteroids = []
+    for _ in range(num_asteroids):
+        radius = ASTEROID_MIN_RADIUS * rng.randint(1, ASTEROID_KINDS)
+        asteroid = Asteroid(rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT), radius)
+        asteroid.velocity = pygame.Vector2(rng.uniform(40, 100), 0).rotate(rng.uniform(0, 360))
+        asteroids.append(asteroid)
+    shots = []
+    for _ in range(num_shots):
+        shot = Shot(rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT))
+        shot.velocity = pygame.Vector2(0, 500).rotate(rng.uniform(0, 360))
+        shots.append(shot)
+    return asteroids, shots
+
+
+def move(objects, dt):
+    # integrate and wrap around the screen, so the objects stay spread out
+    for obj in objects:
+        obj.position += obj.velocity * dt
+        obj.position.x %= SCREEN_WIDTH
+        obj.position.y %= SCREEN_HEIGHT
+
+
+def is_collide_sqrt(a, b):
+    # the narrowphase CircleShape.is_collide used before comparing squared distances
+    return a.position.distance_to(b.position) < (a.radius + b.radius)
+
+
+def run_steps(broadphase, narrowphase, asteroids, shots, steps, dt):
+    # the collide_sprites loop without the splitting, returns the time spent
+    # colliding and the number of hits found
+    elapsed = 0
+    hits = 0
+    for _ in range(steps):
+        move(asteroids, dt)
+        move(shots, dt)
+        start = time.perf_counter()
+        broadphase.rebuild(asteroids)
+        for shot in shots:
+            for asteroid in broadphase.query(shot):
+                if narrowphase(shot, asteroid):
+                    hits += 1
+        elapsed += time.perf_counter() - start
+    return elapsed, hits
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the collision broadphases on moving asteroids")
+    parser.add_argument("--asteroids", type=int, nargs="+", default=[50, 200, 1000], help="asteroid counts to run")
+    parser.add_argument("--shots", type=int, default=50, help="shots querying the broadphase each step")
+    parser.add_argument("--steps", type=int, default=200, help="simulation steps per run")
+    parser.add_argument("--dt", type=float, default=1 / 60, help="simulation timestep in seconds")
+    args = parser.parse_args()
+
+    variants = {"brute-sqrt": (BROADPHASES["brute"], is_collide_sqrt)}
+    for name, broadphase in BROADPHASES.items():
+        variants[name] = (broadphase, Asteroid.is_collide)
+
+    for count in args.asteroids:
+        print(f"{count} asteroids, {args.shots} shots, {args.steps} steps:")
+        baseline = None
+        for name, (broadphase, narrowphase) in variants.items():
+            # same seed for every variant, so they see the same objects and must agree
+            asteroids, shots = make_objects(count, args.shots)
+            elapsed, hits = run_steps(broadphase(), narrowphase, asteroids, shots, args.steps, args.dt)
+            baseline = baseline or elapsed
+            per_step = elapsed / args.steps * 1000
+            print(f"{name:>12}: {per_step:8.3f} ms/step {baseline / elapsed:6.2f}x vs brute-sqrt {hits:8} hits")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,14 @@
 import pygame
 
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+
 # Base class for game objects
 class CircleShape(pygame.sprite.Sprite):
+    # set to an ArrayPhysics on a sub-class to keep its position and velocity there
+    physics = None
+    # set to a Pool on a sub-class to recycle killed objects, see create()
+    pool = None
+
     def __init__(self, x, y, radius):
         # we will be using this later
         if hasattr(self, "containers"):
@@ -9,11 +16,83 @@ class CircleShape(pygame.sprite.Sprite):
         else:
             super().__init__()
 
-        self.position = pygame.Vector2(x, y)
-        self.velocity = pygame.Vector2(0, 0)
+        self.slot = None
+        self._position = pygame.Vector2(x, y)
+        self._velocity = pygame.Vector2(0, 0)
+        self.radius = radius
+        # position at the start of the current simulation step, for interpolation
+        self.previous_position = pygame.Vector2(x, y)
+        if self.physics is not None:
+            self.slot = self.physics.add(self._position, self._velocity, radius)
+
+    # With a physics backend the sprite is only a view over its array slot, reading
+    # returns a copy so in-place updates must be assigned back (`position += ...`).
+    @property
+    def position(self):
+        if self.slot is None:
+            return self._position
+        return pygame.Vector2(*self.physics.position[self.slot])
+
+    @position.setter
+    def position(self, value):
+        if self.slot is None:
+            self._position = value
+        else:
+            self.physics.position[self.slot] = value
+
+    @property
+    def velocity(self):
+        if self.slot is None:
+            return self._velocity
+        return pygame.Vector2(*self.physics.velocity[self.slot])
+
+    @velocity.setter
+    def velocity(self, value):
+        if self.slot is None:
+            self._velocity = value
+        else:
+            self.physics.velocity[self.slot] = value
+
+    @classmethod
+    def create(cls, *args):
+        # use instead of the constructor so pooled objects are reused
+        if cls.pool is not None:
+            return cls.pool.acquire(*args)
+        return cls(*args)
+
+    def reset(self, x, y, radius):
+        # bring a killed object back to the state __init__ leaves it in, reusing its vectors
+        if hasattr(self, "containers"):
+            self.add(self.containers)
+        self._position.update(x, y)
+        self._velocity.update(0, 0)
         self.radius = radius
+        self.previous_position.update(x, y)
+        if self.physics is not None:
+            self.slot = self.physics.add(self._position, self._velocity, radius)
 
-    def draw(self, screen):
+    def kill(self):
+        if self.pool is not None and self.alive():
+            self.pool.release(self)
+        if self.slot is not None:
+            # keep the last state around, e.g. Asteroid.split() reads it after kill()
+            self._position = self.position
+            self._velocity = self.velocity
+            self.physics.remove(self.slot)
+            self.slot = None
+        super().kill()
+
+    def save_state(self):
+        # call before each simulation step, array backed bodies are saved by ArrayPhysics.save_state()
+        self.previous_position.update(self.position)
+
+    def interpolated_position(self, alpha):
+        # where the object is `alpha` of the way through the current simulation step
+        if self.slot is not None:
+            return pygame.Vector2(*self.physics.previous[self.slot]).lerp(self.position, alpha)
+        return self.previous_position.lerp(self.position, alpha)
+
+    def draw(self, screen, alpha=1):
         # sub-classes must override
         pass
 
@@ -21,6 +100,12 @@ class CircleShape(pygame.sprite.Sprite):
         # sub-classes must override
         pass
 
+    def is_off_screen(self, margin):
+        x, y = self.position
+        return not (-margin <= x <= SCREEN_WIDTH + margin and -margin <= y <= SCREEN_HEIGHT + margin)
+
     def is_collide(self, other):
-        return self.position.distance_to(other.position) < (self.radius + other.radius)
+        # compare squared distances to skip the square root
+        radii = self.radius + other.radius
+        return self.position.distance_squared_to(other.position) < radii * radii
 
@@ -0,0 +1,88 @@
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+
+from constants import ASTEROID_MAX_RADIUS
+
+
+class SpatialHash:
+    # Uniform grid broadphase: objects are bucketed by the cells their bounding box
+    # covers, so a query only looks at objects in the cells around it.
+    def __init__(self, cell_size=ASTEROID_MAX_RADIUS * 2):
+        self.cell_size = cell_size
+        self.cells = defaultdict(list)
+
+    def cell_range(self, obj):
+        x, y, r = obj.position.x, obj.position.y, obj.radius
+        size = self.cell_size
+        return (
+            range(int((x - r) // size), int((x + r) // size) + 1),
+            range(int((y - r) // size), int((y + r) // size) + 1),
+        )
+
+    def rebuild(self, objects):
+        self.cells.clear()
+        for obj in objects:
+            xs, ys = self.cell_range(obj)
+            for cx in xs:
+                for cy in ys:
+                    self.cells[(cx, cy)].append(obj)
+
+    def query(self, obj):
+        # objects sharing at least one cell with obj, each returned once
+        xs, ys = self.cell_range(obj)
+        found = {}
+        for cx in xs:
+            for cy in ys:
+                for other in self.cells.get((cx, cy), ()):
+                    found[id(other)] = other
+        return found.values()
+
+
+class SweepAndPrune:
+    # Sort-and-sweep broadphase: objects are kept sorted by the left edge of their
+    # x interval and a query is a binary search over that order. Objects move little
+    # between steps, so insertion sorting last step's order is close to linear.
+    def __init__(self):
+        self.objects = []
+        self.lefts = []
+        self.max_radius = 0
+
+    def rebuild(self, objects):
+        objects = list(objects)
+        present = set(objects)
+        order = [obj for obj in self.objects if obj in present]
+        known = set(order)
+        order.extend(obj for obj in objects if obj not in known)
+        lefts = [obj.position.x - obj.radius for obj in order]
+        for i in range(1, len(order)):
+            obj, left = order[i], lefts[i]
+            j = i - 1
+            while j >= 0 and lefts[j] > left:
+                order[j + 1], lefts[j + 1] = order[j], lefts[j]
+                j -= 1
+            order[j + 1], lefts[j + 1] = obj, left
+        self.objects, self.lefts = order, lefts
+        self.max_radius = max((obj.radius for obj in order), default=0)
+
+    def query(self, obj):
+        # objects whose x interval overlaps obj's, their left edges can be at most
+        # two of the largest radii left of obj's
+        x, r = obj.position.x, obj.radius
+        start = bisect_left(self.lefts, x - r - 2 * self.max_radius)
+        end = bisect_right(self.lefts, x + r)
+        return [other for other in self.objects[start:end] if other.position.x + other.radius >= x - r]
+
+
+class BruteForce:
+    # No broadphase, every object is a candidate. The baseline for benchmark.py.
+    def __init__(self):
+        self.objects = []
+
+    def rebuild(self, objects):
+        self.objects = list(objects)
+
+    def query(self, obj):
+        return self.objects
+
+
+BROADPHASES = {"grid": SpatialHash, "sap": SweepAndPrune, "brute": BruteForce}
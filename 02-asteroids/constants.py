@@ -1,10 +1,15 @@
 SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
 
+# at most this many fixed simulation steps per rendered frame, the rest is dropped
+MAX_STEPS_PER_FRAME = 5
+
 ASTEROID_MIN_RADIUS = 20
 ASTEROID_KINDS = 3
 ASTEROID_SPAWN_RATE = 0.8  # seconds
 ASTEROID_MAX_RADIUS = ASTEROID_MIN_RADIUS * ASTEROID_KINDS
+# asteroids spawn ASTEROID_MAX_RADIUS off screen, despawn only beyond that
+DESPAWN_MARGIN = ASTEROID_MAX_RADIUS * 2
 
 PLAYER_RADIUS = 20
 PLAYER_TURN_SPEED = 300
@@ -0,0 +1,43 @@
+import pygame
+
+
+class ScriptedInput:
+    # Stands in for pygame.key as the player's controls, replaying key presses
+    # from a script instead of the keyboard. Each script line is
+    # `first_frame last_frame key...` (last frame excluded), with keys named like
+    # the pygame.K_* constants without the prefix, e.g. `0 120 a SPACE`.
+    # Blank lines and lines starting with # are ignored.
+    def __init__(self, script=()):
+        self.frame = 0
+        self.ranges = []
+        for line in script:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            first, last, *names = line.split()
+            keys = {getattr(pygame, f"K_{name}") for name in names}
+            self.ranges.append((int(first), int(last), keys))
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path) as f:
+            return cls(f)
+
+    def advance(self):
+        self.frame += 1
+
+    def get_pressed(self):
+        pressed = set()
+        for first, last, keys in self.ranges:
+            if first <= self.frame < last:
+                pressed |= keys
+        return KeyState(pressed)
+
+
+class KeyState:
+    # indexable by key code like the sequence pygame.key.get_pressed() returns
+    def __init__(self, pressed):
+        self.pressed = pressed
+
+    def __getitem__(self, key):
+        return key in self.pressed
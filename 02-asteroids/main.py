@@ -1,58 +1,214 @@
+import argparse
+import os
 import pygame
+import random
 import sys
+import time
 
 from asteroid import Asteroid
 from asteroidfield import AsteroidField
-from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+from collision import BROADPHASES
+from inputs import ScriptedInput
+from physics import ArrayPhysics
+from pool import Pool
+from profiler import FrameProfiler
+from renderer import RENDERERS
+from replay import Recorder, Replay
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT, MAX_STEPS_PER_FRAME
 from player import Player, Shot
+from world import World
+
+
+def show_object_counts(asteroids, shots):
+    caption = f"Asteroids - {len(asteroids)} asteroids, {len(shots)} shots"
+    for cls in (Asteroid, Shot):
+        if cls.pool is not None:
+            caption += f", {cls.__name__.lower()} pool {cls.pool.hits} hits/{cls.pool.misses} misses"
+    pygame.display.set_caption(caption)
 
 
 def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--no-pool", action="store_true", help="allocate new asteroids and shots instead of recycling killed ones")
+    parser.add_argument("--physics", choices=["python", "numpy"], default="python",
+                        help="integrate and collide asteroids and shots per sprite or vectorized in numpy arrays")
+    parser.add_argument("--broadphase", choices=BROADPHASES, default="grid",
+                        help="collision candidate search with --physics python: uniform grid, sweep and prune on x, or every pair")
+    parser.add_argument("--renderer", choices=RENDERERS, default="cached",
+                        help="redraw everything each frame, or blit cached images and update only dirty rects")
+    parser.add_argument("--headless", action="store_true",
+                        help="simulate without a display or frame rate limit, with a fixed timestep")
+    parser.add_argument("--frames", type=int, default=None, help="stop after this many frames")
+    parser.add_argument("--dt", type=float, default=1 / 60, help="fixed simulation timestep in seconds")
+    parser.add_argument("--variable-step", action="store_true",
+                        help="step the simulation once per frame by the frame time instead of in fixed steps")
+    parser.add_argument("--seed", type=int, default=None, help="seed asteroid spawning and splitting")
+    parser.add_argument("--invincible", action="store_true", help="keep going when the player is hit, e.g. for soak tests")
+    parser.add_argument("--profile", action="store_true", help="time each phase of the main loop and show an overlay")
+    parser.add_argument("--profile-csv", metavar="FILE", help="write per-frame phase timings to a CSV file (implies --profile)")
+    parser.add_argument("--record", metavar="FILE", help="record key presses, seed and asteroid spawns to a replay file")
+    parser.add_argument("--replay", metavar="FILE", help="play back a recorded session")
+    parser.add_argument("--fast-forward", action="store_true", help="play back the --replay as fast as possible without rendering")
+    parser.add_argument("--inputs", help="script of key presses replacing the keyboard, see inputs.ScriptedInput")
+    args = parser.parse_args()
+
+    replay = None
+    if args.replay:
+        if args.record:
+            parser.error("--record cannot be used with --replay")
+        replay = Replay(args.replay)
+        # replays only reproduce with the settings they were recorded with
+        args.seed, args.dt = replay.seed, replay.dt
+        args.physics = "numpy" if replay.numpy else "python"
+        args.invincible, args.broadphase = replay.invincible, replay.broadphase
+        args.variable_step = False
+        args.headless = args.headless or args.fast_forward
+    elif args.fast_forward:
+        parser.error("--fast-forward needs a --replay")
+    if args.record:
+        if args.variable_step:
+            parser.error("--record needs fixed simulation steps, drop --variable-step")
+        if args.seed is None:
+            args.seed = random.randrange(2**63)
+        elif not -2**63 <= args.seed < 2**63:
+            parser.error("--seed must fit in a signed 64-bit integer to be recorded")
+
     print("Starting Asteroids!")
     print(f"Screen width: {SCREEN_WIDTH}")
     print(f"Screen height: {SCREEN_HEIGHT}")
     
+    if args.headless:
+        # no window is ever opened, but keep SDL from looking for a display
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
     pygame.init()
-    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-    clock = pygame.time.Clock()
-    dt = 0
-
-    updatable = pygame.sprite.Group()
-    drawable = pygame.sprite.Group()
-    asteroids = pygame.sprite.Group()
-    shots = pygame.sprite.Group()
-
-    Asteroid.containers = (asteroids, updatable, drawable)
-    AsteroidField.containers = (updatable)
-    Shot.containers = (shots, updatable, drawable)
-    Player.containers = (updatable, drawable)
-
-    asteroidfield = AsteroidField()
-    player = Player(SCREEN_WIDTH/2, SCREEN_HEIGHT/2)
-    
-    status = True
-    while status:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                return
-
-        updatable.update(dt)
-        for asteroid in asteroids:
-            if player.is_collide(asteroid):
-                print("Game over!")
-                sys.exit()
-            for shot in shots:
-                if shot.is_collide(asteroid):
-                    shot.kill()
-                    asteroid.split()
-
-        screen.fill("black")
-        for obj in drawable:
-            obj.draw(screen)
-        pygame.display.flip()
+    if not args.headless:
+        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        renderer = RENDERERS[args.renderer](screen)
+        clock = pygame.time.Clock()
+
+    if not args.no_pool:
+        Asteroid.pool = Pool(Asteroid)
+        Shot.pool = Pool(Shot)
+    physics = None
+    if args.physics == "numpy":
+        physics = ArrayPhysics()
+        Asteroid.physics = physics
+        Shot.physics = physics
+
+    if args.seed is not None:
+        # separate streams, so replaying spawns from a log leaves the splits unchanged
+        Asteroid.rng = random.Random(args.seed)
+        AsteroidField.rng = random.Random(args.seed + 1)
+    inputs = None
+    if args.inputs:
+        inputs = ScriptedInput.from_file(args.inputs)
+    elif args.headless and replay is None:
+        inputs = ScriptedInput()
+    if inputs is not None:
+        Player.controls = inputs
+    recorder = None
+    if replay is not None:
+        Player.controls = replay
+        AsteroidField.playback = replay
+    elif args.record:
+        recorder = Recorder(
+            args.record, args.seed, args.dt, Player.controls, physics is not None, args.invincible, args.broadphase
+        )
+        Player.controls = recorder
+        AsteroidField.recorder = recorder
+
+    world = World(physics, args.broadphase)
+    asteroids, shots = world.asteroids, world.shots
+    last_counts = None
+    frame = 0
+    steps = 0
+    player_hit = False
+    # simulation time not stepped yet, and the time the last frame took
+    accumulator = 0.0
+    frame_time = 0.0
+    profiler = None
+    if args.profile or args.profile_csv:
+        profiler = FrameProfiler(csv_path=args.profile_csv)
+    start = time.perf_counter()
+    if profiler:
+        profiler.start()
+
+    while args.frames is None or frame < args.frames:
+        if not args.headless:
+            if any(event.type == pygame.QUIT for event in pygame.event.get()):
+                break
+            if profiler:
+                profiler.mark("events")
+
+        # Fixed steps of args.dt consume the time that passed, the leftover fraction
+        # of a step is drawn by interpolating between the last two states.
+        # Headless runs take one fixed step per frame, --variable-step one step of
+        # the frame time.
+        if args.headless or args.variable_step:
+            step = args.dt if args.headless else frame_time
+            accumulator = step
+            max_steps = 1
+        else:
+            step = args.dt
+            accumulator += frame_time
+            max_steps = MAX_STEPS_PER_FRAME
+        frame_steps = 0
+        while frame_steps < max_steps and accumulator >= step and not (replay and replay.finished()):
+            player_hit = world.step(step, profiler)
+            accumulator -= step
+            frame_steps += 1
+            if inputs is not None:
+                inputs.advance()
+            if player_hit and not args.invincible:
+                break
+        if max_steps == 1 or accumulator >= step:
+            # too far behind to catch up: slow the game down rather than fall further behind
+            accumulator = 0.0
+        steps += frame_steps
+        if player_hit and not args.invincible:
+            print("Game over!")
+            break
+        if replay is not None and replay.finished():
+            print("End of replay")
+            break
+        frame += 1
+
+        if args.headless:
+            if profiler:
+                profiler.end_frame(len(asteroids), len(shots))
+            continue
+
+        counts = (len(asteroids), len(shots))
+        if counts != last_counts:
+            show_object_counts(asteroids, shots)
+            last_counts = counts
+
+        alpha = accumulator / step if max_steps > 1 else 1
+        renderer.draw(world.drawable, profiler.draw if profiler else None, alpha)
+        if profiler:
+            profiler.mark("draw")
+        renderer.present()
+        if profiler:
+            profiler.mark("flip")
         
         # limit the framerate to 60 FPS
-        dt = clock.tick(60) / 1000
+        frame_time = clock.tick(60) / 1000
+        if profiler:
+            profiler.mark("wait")
+            profiler.end_frame(len(asteroids), len(shots))
+
+    if recorder is not None:
+        recorder.close()
+    if profiler:
+        profiler.close()
+        print("\n".join(profiler.summary()))
+    if args.headless:
+        elapsed = time.perf_counter() - start
+        print(f"Simulated {steps} steps ({steps * args.dt:.1f}s of game time) in {elapsed:.2f}s, "
+              f"{steps / elapsed:.0f} steps/s")
+        print(f"{len(asteroids)} asteroids, {len(shots)} shots alive")
+    if player_hit and not args.invincible:
+        sys.exit()
 
 
 if __name__ == "__main__":
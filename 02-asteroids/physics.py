@@ -0,0 +1,76 @@
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class ArrayPhysics:
+    # Structure-of-arrays storage for moving circles: position, velocity and radius
+    # of every body live in numpy arrays and are integrated in one vectorized step.
+    # previous holds the positions at the start of the current step, for interpolation.
+    # Bodies refer to their row by slot, freed slots are reused.
+    def __init__(self, capacity=256):
+        if np is None:
+            raise RuntimeError("the numpy physics backend requires numpy to be installed")
+        self.position = np.zeros((capacity, 2))
+        self.previous = np.zeros((capacity, 2))
+        self.velocity = np.zeros((capacity, 2))
+        self.radius = np.zeros(capacity)
+        self.free = list(range(capacity - 1, -1, -1))
+
+    def grow(self):
+        capacity = len(self.radius)
+        self.position = np.concatenate([self.position, np.zeros((capacity, 2))])
+        self.previous = np.concatenate([self.previous, np.zeros((capacity, 2))])
+        self.velocity = np.concatenate([self.velocity, np.zeros((capacity, 2))])
+        self.radius = np.concatenate([self.radius, np.zeros(capacity)])
+        self.free.extend(range(2 * capacity - 1, capacity - 1, -1))
+
+    def add(self, position, velocity, radius):
+        if not self.free:
+            self.grow()
+        slot = self.free.pop()
+        self.position[slot] = position
+        self.previous[slot] = position
+        self.velocity[slot] = velocity
+        self.radius[slot] = radius
+        return slot
+
+    def remove(self, slot):
+        # a free row keeps zero velocity so step() can integrate every row blindly
+        self.velocity[slot] = 0
+        self.radius[slot] = 0
+        self.free.append(slot)
+
+    def save_state(self):
+        # call before each simulation step
+        self.previous[:] = self.position
+
+    def step(self, dt):
+        self.position += self.velocity * dt
+
+    def outside(self, slots, left, top, right, bottom):
+        # indices into slots of the bodies whose centre is outside the rectangle
+        if not slots:
+            return []
+        x, y = self.position[slots].T
+        return np.flatnonzero((x < left) | (x > right) | (y < top) | (y > bottom)).tolist()
+
+    def collide(self, slots_a, slots_b):
+        # index pairs (i, j) such that body slots_a[i] overlaps body slots_b[j],
+        # tested all at once on squared distances
+        if not slots_a or not slots_b:
+            return []
+        pos_a, pos_b = self.position[slots_a], self.position[slots_b]
+        delta = pos_a[:, None, :] - pos_b[None, :, :]
+        dist_sq = np.einsum("ijk,ijk->ij", delta, delta)
+        reach = self.radius[slots_a][:, None] + self.radius[slots_b][None, :]
+        return list(zip(*np.nonzero(dist_sq < reach * reach)))
+
+    def hits(self, position, radius, slots):
+        # indices into slots of the bodies overlapping a circle that is not in the arrays
+        if not slots:
+            return []
+        delta = self.position[slots] - (position.x, position.y)
+        reach = self.radius[slots] + radius
+        return np.flatnonzero(np.einsum("ij,ij->i", delta, delta) < reach * reach).tolist()
@@ -3,28 +3,44 @@ import pygame
 from circleshape import CircleShape
 from constants import PLAYER_RADIUS, PLAYER_TURN_SPEED, PLAYER_SPEED, SHOT_RADIUS, PLAYER_SHOOT_SPEED, PLAYER_SHOOT_COOLDOWN
 
+def triangle_points(center, rotation, radius):
+    forward = pygame.Vector2(0, 1).rotate(rotation)
+    right = pygame.Vector2(0, 1).rotate(rotation + 90) * radius / 1.5
+    a = center + forward * radius
+    b = center - forward * radius - right
+    c = center - forward * radius + right
+    return [a, b, c]
+
+
 class Player(CircleShape):
+    # anything with a get_pressed() like pygame.key, e.g. an inputs.ScriptedInput
+    controls = pygame.key
+
     def __init__(self, x, y):
         super().__init__(x, y, PLAYER_RADIUS)
         self.rotation = 0
+        self.previous_rotation = 0
         self.timer = 0
 
     def triangle(self):
-        forward = pygame.Vector2(0, 1).rotate(self.rotation)
-        right = pygame.Vector2(0, 1).rotate(self.rotation + 90) * self.radius / 1.5
-        a = self.position + forward * self.radius
-        b = self.position - forward * self.radius - right
-        c = self.position - forward * self.radius + right
-        return [a, b, c]
+        return triangle_points(self.position, self.rotation, self.radius)
 
-    def draw(self, screen):
-        pygame.draw.polygon(screen, "white", points=self.triangle(), width=2)
+    def save_state(self):
+        super().save_state()
+        self.previous_rotation = self.rotation
+
+    def interpolated_rotation(self, alpha):
+        return self.previous_rotation + (self.rotation - self.previous_rotation) * alpha
+
+    def draw(self, screen, alpha=1):
+        points = triangle_points(self.interpolated_position(alpha), self.interpolated_rotation(alpha), self.radius)
+        pygame.draw.polygon(screen, "white", points=points, width=2)
 
     def rotate(self, dt):
         self.rotation += PLAYER_TURN_SPEED * dt
 
     def update(self, dt):
-        keys = pygame.key.get_pressed()
+        keys = self.controls.get_pressed()
         if keys[pygame.K_a]:
             self.rotate(-dt)
         if keys[pygame.K_d]:
@@ -43,7 +59,7 @@ class Player(CircleShape):
         self.position += forward * PLAYER_SPEED * dt
 
     def shoot(self, dt):
-        shot = Shot(self.position.x, self.position.y)
+        shot = Shot.create(self.position.x, self.position.y)
         shot.velocity = pygame.Vector2(0, 1).rotate(self.rotation) * PLAYER_SHOOT_SPEED
         self.timer = PLAYER_SHOOT_COOLDOWN
 
@@ -52,9 +68,14 @@ class Shot(CircleShape):
     def __init__(self, x, y):
         super().__init__(x, y, SHOT_RADIUS)
 
-    def draw(self, screen):
-        pygame.draw.circle(screen, "white", self.position, self.radius, width=2)
+    def reset(self, x, y):
+        super().reset(x, y, SHOT_RADIUS)
+
+    def draw(self, screen, alpha=1):
+        pygame.draw.circle(screen, "white", self.interpolated_position(alpha), self.radius, width=2)
 
     def update(self, dt):
-        self.position += self.velocity * dt
+        # array backed bodies are integrated all at once by the physics backend
+        if self.slot is None:
+            self.position += self.velocity * dt
 
@@ -0,0 +1,28 @@
+class Pool:
+    # Recycles killed objects of one class instead of allocating new ones.
+    # The class must implement reset() taking its constructor arguments.
+    # Released objects only become free on flush(), so an object killed during a
+    # simulation step is not handed out again while that step still refers to it.
+    def __init__(self, cls):
+        self.cls = cls
+        self.free = []
+        self.pending = []
+        self.hits = 0
+        self.misses = 0
+
+    def acquire(self, *args):
+        if self.free:
+            self.hits += 1
+            obj = self.free.pop()
+            obj.reset(*args)
+            return obj
+        self.misses += 1
+        return self.cls(*args)
+
+    def release(self, obj):
+        self.pending.append(obj)
+
+    def flush(self):
+        # call at the end of each simulation step
+        self.free.extend(self.pending)
+        self.pending.clear()
@@ -0,0 +1,87 @@
+import csv
+import time
+from collections import deque
+
+import pygame
+
+PHASES = ("events", "update", "collide", "draw", "flip", "wait")
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class FrameProfiler:
+    # Times each phase of the main loop. Call start() once, then mark(phase) right
+    # after a phase finishes and end_frame() after the last one. The last `size`
+    # frames are kept in ring buffers, every frame can also be written to a CSV trace.
+    def __init__(self, size=600, csv_path=None):
+        self.phases = {phase: deque(maxlen=size) for phase in PHASES}
+        self.frame_times = deque(maxlen=size)
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.frame = 0
+        self.frame_start = self.last = time.perf_counter()
+        self.csv_file = None
+        if csv_path is not None:
+            self.csv_file = open(csv_path, "w", newline="")
+            self.csv = csv.writer(self.csv_file)
+            self.csv.writerow(["frame", *PHASES, "total", "asteroids", "shots"])
+        self.font = None
+        self.overlay = None
+        self.overlay_frame = None
+
+    def start(self):
+        self.frame_start = self.last = time.perf_counter()
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.current[phase] += now - self.last
+        self.last = now
+
+    def end_frame(self, asteroids, shots):
+        total = self.last - self.frame_start
+        for phase, elapsed in self.current.items():
+            self.phases[phase].append(elapsed)
+        self.frame_times.append(total)
+        self.counts = (asteroids, shots)
+        if self.csv_file is not None:
+            self.csv.writerow([self.frame, *(f"{self.current[p] * 1000:.4f}" for p in PHASES),
+                               f"{total * 1000:.4f}", asteroids, shots])
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.frame += 1
+        self.frame_start = self.last
+
+    def summary(self):
+        # lines of FPS, p50/p99 frame time and p50/p99 per phase in milliseconds
+        if not self.frame_times:
+            return []
+        mean = sum(self.frame_times) / len(self.frame_times)
+        lines = [
+            f"FPS {1 / mean if mean else 0:.0f}  frame p50 {percentile(self.frame_times, 0.5) * 1000:.2f}ms"
+            f" p99 {percentile(self.frame_times, 0.99) * 1000:.2f}ms",
+            f"{self.counts[0]} asteroids, {self.counts[1]} shots",
+        ]
+        for phase, times in self.phases.items():
+            lines.append(f"{phase:>8} p50 {percentile(times, 0.5) * 1000:.2f}ms p99 {percentile(times, 0.99) * 1000:.2f}ms")
+        return lines
+
+    def draw(self, screen, every=15):
+        # the text is re-rendered every few frames only, sorting the buffers is not free
+        if self.overlay is None or self.frame - self.overlay_frame >= every:
+            if self.font is None:
+                self.font = pygame.font.Font(None, 20)
+            lines = [self.font.render(line, True, "yellow") for line in self.summary()]
+            width = max((line.get_width() for line in lines), default=0)
+            self.overlay = pygame.Surface((width, sum(line.get_height() for line in lines)), pygame.SRCALPHA)
+            y = 0
+            for line in lines:
+                self.overlay.blit(line, (0, y))
+                y += line.get_height()
+            self.overlay_frame = self.frame
+        return screen.blit(self.overlay, (8, 8))
+
+    def close(self):
+        if self.csv_file is not None:
+            self.csv_file.close()
+            self.csv_file = None
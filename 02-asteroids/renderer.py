@@ -0,0 +1,113 @@
+import math
+
+import pygame
+
+from player import Player, triangle_points
+
+# the player image is cached per bucket of this many degrees of rotation
+ROTATION_STEP = 2
+# transparent color of the erase images, which are drawn in black
+ERASE_COLORKEY = (255, 0, 255)
+
+
+class SimpleRenderer:
+    # Clears and redraws the whole screen every frame with the objects' own draw()
+    def __init__(self, screen):
+        self.screen = screen
+
+    def draw(self, drawable, overlay=None, alpha=1):
+        # overlay is an optional function drawing on top of the screen, e.g. FrameProfiler.draw,
+        # alpha how far into the current simulation step objects are drawn
+        self.screen.fill("black")
+        for obj in drawable:
+            obj.draw(self.screen, alpha)
+        if overlay is not None:
+            overlay(self.screen)
+
+    def present(self):
+        pygame.display.flip()
+
+
+class CachedRenderer:
+    # Blits pre-rendered outlines instead of drawing shapes: one per circle radius
+    # (asteroid kinds and shots) and one per rotation bucket of the player.
+    # Last frame's outlines are erased by blitting the same shapes in black and only
+    # the rects drawn to this frame or the last one are sent to the display, so the
+    # cost follows the objects on screen, not the screen size.
+    def __init__(self, screen):
+        self.screen = screen
+        self.images = {}
+        self.erase = []
+        self.erase_rects = []
+        self.dirty = []
+        self.update_rects = []
+        screen.fill("black")
+        pygame.display.flip()
+
+    def make_images(self, key, size, draw):
+        # white outline on a black colorkey, and its eraser: the outline in black
+        images = []
+        for color, colorkey in (("white", "black"), ("black", ERASE_COLORKEY)):
+            image = pygame.Surface((size, size))
+            image.fill(colorkey)
+            draw(image, color)
+            image.set_colorkey(colorkey, pygame.RLEACCEL)
+            images.append(image.convert())
+        self.images[key] = tuple(images)
+        return self.images[key]
+
+    def circle_images(self, radius):
+        key = ("circle", radius)
+        if key in self.images:
+            return self.images[key]
+        size = int(radius) * 2 + 2
+        return self.make_images(
+            key, size, lambda image, color: pygame.draw.circle(image, color, (size / 2, size / 2), radius, width=2)
+        )
+
+    def player_images(self, rotation, radius):
+        bucket = round(rotation / ROTATION_STEP) % (360 // ROTATION_STEP)
+        key = ("player", bucket, radius)
+        if key in self.images:
+            return self.images[key]
+        # the back corners reach past the radius, size the image from the points themselves
+        offsets = triangle_points(pygame.Vector2(0, 0), bucket * ROTATION_STEP, radius)
+        size = math.ceil(max(abs(coord) for point in offsets for coord in point)) * 2 + 4
+        points = [point + (size / 2, size / 2) for point in offsets]
+        return self.make_images(
+            key, size, lambda image, color: pygame.draw.polygon(image, color, points=points, width=2)
+        )
+
+    def draw(self, drawable, overlay=None, alpha=1):
+        # overlay is an optional function drawing on top of the screen and returning
+        # the rect it drew to, e.g. FrameProfiler.draw
+        self.screen.blits(self.erase, doreturn=False)
+        for rect in self.erase_rects:
+            self.screen.fill("black", rect)
+
+        blits = []
+        self.erase = []
+        for obj in drawable:
+            if isinstance(obj, Player):
+                image, eraser = self.player_images(obj.interpolated_rotation(alpha), obj.radius)
+            else:
+                image, eraser = self.circle_images(obj.radius)
+            x, y = obj.interpolated_position(alpha)
+            topleft = (x - image.get_width() / 2, y - image.get_height() / 2)
+            blits.append((image, topleft))
+            self.erase.append((eraser, topleft))
+        rects = self.screen.blits(blits)
+        self.erase_rects = []
+        if overlay is not None:
+            rect = overlay(self.screen)
+            rects.append(rect)
+            self.erase_rects.append(rect)
+        # what changed is where things were drawn last frame and where they are now
+        self.update_rects = self.dirty + rects
+        self.dirty = rects
+
+    def present(self):
+        pygame.display.update(self.update_rects)
+
+
+RENDERERS = {"simple": SimpleRenderer, "cached": CachedRenderer}
@@ -0,0 +1,91 @@
+import struct
+
+import pygame
+
+from inputs import KeyState
+
+# A replay is a header followed by a stream of records. Each simulation step
+# writes the asteroids AsteroidField spawned during it, then one byte holding
+# the pressed keys as a bitmask of KEYS. Spawn records start with SPAWN_TAG,
+# which no key mask can be equal to.
+MAGIC = b"ASTREPLAY"
+VERSION = 2
+HEADER = struct.Struct("<BqdB8s")  # version, seed, dt, flags, broadphase name
+SPAWN = struct.Struct("<B4d")  # radius, x, y, velocity x, velocity y
+SPAWN_TAG = 0x80
+FLAG_NUMPY = 1
+FLAG_INVINCIBLE = 2
+KEYS = (pygame.K_a, pygame.K_d, pygame.K_w, pygame.K_s, pygame.K_SPACE)
+
+
+class Recorder:
+    # Stands in for the player's controls and AsteroidField.recorder, logging what
+    # they see to a replay file while passing the real key presses through.
+    # Everything else that changes how the game plays out is recorded in the header.
+    def __init__(self, path, seed, dt, controls, numpy=False, invincible=False, broadphase="grid"):
+        self.controls = controls
+        flags = (FLAG_NUMPY if numpy else 0) | (FLAG_INVINCIBLE if invincible else 0)
+        self.file = open(path, "wb")
+        self.file.write(MAGIC + HEADER.pack(VERSION, seed, dt, flags, broadphase.encode("ascii")))
+
+    def get_pressed(self):
+        keys = self.controls.get_pressed()
+        mask = 0
+        for bit, key in enumerate(KEYS):
+            if keys[key]:
+                mask |= 1 << bit
+        self.file.write(bytes((mask,)))
+        return keys
+
+    def spawned(self, radius, position, velocity):
+        self.file.write(bytes((SPAWN_TAG,)) + SPAWN.pack(radius, position.x, position.y, velocity.x, velocity.y))
+
+    def close(self):
+        self.file.close()
+
+
+class Replay:
+    # Stands in for the player's controls and AsteroidField.playback, feeding back a
+    # recorded session one simulation step at a time
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        if not data.startswith(MAGIC):
+            raise ValueError(f"{path} is not an asteroids replay")
+        offset = len(MAGIC)
+        version = data[offset]
+        if version != VERSION:
+            raise ValueError(f"unsupported replay version {version}")
+        _, self.seed, self.dt, flags, broadphase = HEADER.unpack_from(data, offset)
+        self.numpy = bool(flags & FLAG_NUMPY)
+        self.invincible = bool(flags & FLAG_INVINCIBLE)
+        self.broadphase = broadphase.rstrip(b"\0").decode("ascii")
+        offset += HEADER.size
+
+        # (spawns, key mask) per step, spawns after the last key mask belong to an
+        # unfinished step and are dropped
+        self.steps = []
+        spawns = []
+        while offset < len(data):
+            tag = data[offset]
+            offset += 1
+            if tag == SPAWN_TAG:
+                radius, x, y, vx, vy = SPAWN.unpack_from(data, offset)
+                offset += SPAWN.size
+                spawns.append((radius, pygame.Vector2(x, y), pygame.Vector2(vx, vy)))
+            else:
+                self.steps.append((spawns, tag))
+                spawns = []
+        self.step = 0
+
+    def finished(self):
+        return self.step >= len(self.steps)
+
+    def spawns(self):
+        # AsteroidField updates before the player in a step, so this is the current step
+        return self.steps[self.step][0]
+
+    def get_pressed(self):
+        mask = self.steps[self.step][1]
+        self.step += 1
+        return KeyState({key for bit, key in enumerate(KEYS) if mask & (1 << bit)})
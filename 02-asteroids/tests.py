@@ -0,0 +1,82 @@
+import os
+import tempfile
+import unittest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+import physics
+from asteroid import Asteroid
+from asteroidfield import AsteroidField
+from inputs import ScriptedInput
+from player import Player, Shot
+from pool import Pool
+from replay import Recorder, Replay
+from world import World
+
+
+class Tests(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        Player.controls = ScriptedInput()
+        # no spawns, the tests place every asteroid themselves
+        self.addCleanup(setattr, AsteroidField, "update", AsteroidField.update)
+        AsteroidField.update = lambda self, dt: None
+        for cls in (Asteroid, Shot):
+            self.addCleanup(setattr, cls, "pool", None)
+            self.addCleanup(setattr, cls, "physics", None)
+
+    def world(self, array_physics=False):
+        # a world with pooled asteroids and shots and the player out of the way
+        backend = None
+        if array_physics:
+            if physics.np is None:
+                self.skipTest("numpy is not installed")
+            backend = physics.ArrayPhysics()
+        for cls in (Asteroid, Shot):
+            cls.pool = Pool(cls)
+            cls.physics = backend
+        world = World(backend)
+        world.player.position = pygame.Vector2(100, 100)
+        return world
+
+    def test_pool_reuses_only_after_flush(self):
+        self.world()
+        asteroid = Asteroid.create(600, 300, 60)
+        asteroid.kill()
+        self.assertIsNot(Asteroid.create(600, 300, 60), asteroid)
+        Asteroid.pool.flush()
+        self.assertIs(Asteroid.create(600, 300, 60), asteroid)
+
+    def test_split_never_reuses_self(self):
+        world = self.world()
+        asteroid = Asteroid.create(600, 300, 60)
+        asteroid.split()
+        self.assertFalse(asteroid.alive())
+        self.assertNotIn(asteroid, world.asteroids)
+        self.assertEqual(len(world.asteroids), 2)
+
+    def test_split_by_two_shots_in_one_step(self):
+        for array_physics in (False, True):
+            with self.subTest(array_physics=array_physics):
+                world = self.world(array_physics)
+                asteroid = Asteroid.create(600, 300, 60)
+                # the second shot only reaches the asteroid, not its smaller children
+                Shot.create(600, 300)
+                Shot.create(660, 300)
+                world.step(0)
+                self.assertNotIn(asteroid, world.asteroids)
+                self.assertEqual(sorted(child.radius for child in world.asteroids), [40, 40])
+                self.assertEqual(len(world.shots), 1)
+
+    def test_replay_negative_seed(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "negative.replay")
+            Recorder(path, -5, 1 / 60, ScriptedInput(), broadphase="sap").close()
+            replay = Replay(path)
+        self.assertEqual((replay.seed, replay.broadphase), (-5, "sap"))
+
+
+if __name__ == "__main__":
+    unittest.main()
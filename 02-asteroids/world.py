@@ -0,0 +1,111 @@
+import pygame
+
+from asteroid import Asteroid
+from asteroidfield import AsteroidField
+from collision import BROADPHASES
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT, DESPAWN_MARGIN
+from player import Player, Shot
+
+
+# The collide_* functions split asteroids hit by shots and return whether the player was hit
+
+
+def collide_sprites(broadphase, player, asteroids, shots):
+    broadphase.rebuild(asteroids)
+    for asteroid in broadphase.query(player):
+        if player.is_collide(asteroid):
+            return True
+    for shot in shots:
+        for asteroid in broadphase.query(shot):
+            # an asteroid split by an earlier shot this frame is already gone
+            if asteroid.alive() and shot.is_collide(asteroid):
+                shot.kill()
+                asteroid.split()
+                break
+    return False
+
+
+def collide_arrays(physics, player, asteroids, shots):
+    asteroids = asteroids.sprites()
+    shots = shots.sprites()
+    asteroid_slots = [asteroid.slot for asteroid in asteroids]
+    if physics.hits(player.position, player.radius, asteroid_slots):
+        return True
+    for i, j in physics.collide([shot.slot for shot in shots], asteroid_slots):
+        shot, asteroid = shots[i], asteroids[j]
+        # same rules as collide_sprites: one asteroid per shot, one split per asteroid
+        if shot.alive() and asteroid.alive():
+            shot.kill()
+            asteroid.split()
+    return False
+
+
+def despawn_off_screen(*groups):
+    for group in groups:
+        for obj in group:
+            if obj.is_off_screen(DESPAWN_MARGIN):
+                obj.kill()
+
+
+def despawn_arrays(physics, *groups):
+    for group in groups:
+        sprites = group.sprites()
+        slots = [obj.slot for obj in sprites]
+        for i in physics.outside(
+            slots, -DESPAWN_MARGIN, -DESPAWN_MARGIN, SCREEN_WIDTH + DESPAWN_MARGIN, SCREEN_HEIGHT + DESPAWN_MARGIN
+        ):
+            sprites[i].kill()
+
+
+class World:
+    # The game state and one step of the simulation, independent of rendering.
+    # Pools, physics backend, rng and controls are configured on the classes first.
+    # broadphase names the collision.BROADPHASES entry used without a physics backend.
+    def __init__(self, physics=None, broadphase="grid"):
+        self.physics = physics
+        self.updatable = pygame.sprite.Group()
+        self.drawable = pygame.sprite.Group()
+        # sprites moved by their own update(), whose state is saved one by one
+        self.moving = pygame.sprite.Group()
+        self.asteroids = pygame.sprite.Group()
+        self.shots = pygame.sprite.Group()
+
+        # array backed asteroids and shots are saved and moved all at once by the
+        # physics backend, so they stay out of the per-sprite groups
+        moving = (self.updatable, self.moving) if physics is None else ()
+        Asteroid.containers = (self.asteroids, self.drawable, *moving)
+        AsteroidField.containers = (self.updatable)
+        Shot.containers = (self.shots, self.drawable, *moving)
+        Player.containers = (self.updatable, self.drawable, self.moving)
+
+        self.asteroidfield = AsteroidField()
+        self.player = Player(SCREEN_WIDTH/2, SCREEN_HEIGHT/2)
+        self.broadphase = BROADPHASES[broadphase]()
+
+    def step(self, dt, profiler=None):
+        # returns whether the player was hit
+        for obj in self.moving:
+            obj.save_state()
+        if self.physics is not None:
+            self.physics.save_state()
+        self.updatable.update(dt)
+        if self.physics is not None:
+            self.physics.step(dt)
+        if profiler:
+            profiler.mark("update")
+
+        if self.physics is None:
+            player_hit = collide_sprites(self.broadphase, self.player, self.asteroids, self.shots)
+        else:
+            player_hit = collide_arrays(self.physics, self.player, self.asteroids, self.shots)
+        if self.physics is None:
+            despawn_off_screen(self.asteroids, self.shots)
+        else:
+            despawn_arrays(self.physics, self.asteroids, self.shots)
+        # nothing killed this step is referenced any more, let the pools reuse it
+        for cls in (Asteroid, Shot):
+            if cls.pool is not None:
+                cls.pool.flush()
+        if profiler:
+            profiler.mark("collide")
+        return player_hit
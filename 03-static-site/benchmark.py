@@ -0,0 +1,104 @@
+import argparse
+import os
+import tempfile
+import time
+
+from src.main import list_files
+from src.markdown import extract_markdown_title, markdown_to_html, preprocess_markdown
+from src.markdown_block import BlockType, block_to_block_type, markdown_to_blocks
+from src.markdown_inline import text_to_text_nodes, text_to_text_nodes_multipass
+from src.template import load_template
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+TEMPLATE_PATH = os.path.join(PROJECT_ROOT, "template.html")
+CONTENT_DIR = os.path.join(PROJECT_ROOT, "content")
+SAMPLE_PATH = os.path.join(CONTENT_DIR, "blog", "tom", "index.md")
+
+
+def render_replace(tmpl_path: str, title: str, content: str) -> str:
+    """
+    The template step of `generate_page` before templates were compiled:
+    read the file and replace each placeholder in a pass over the template.
+    """
+    with open(tmpl_path, "r") as f:
+        tmpl = f.read()
+    return tmpl.replace("{{ Title }}", title).replace("{{ Content }}", content)
+
+
+def render_compiled(tmpl_path: str, title: str, content: str) -> str:
+    return load_template(tmpl_path).render(Title=title, Content=content)
+
+
+def bench_template(pages: int) -> dict[str, float]:
+    """
+    Time the template step of `pages` pages, excluding markdown conversion.
+    """
+    with open(SAMPLE_PATH, "r") as f:
+        md = f.read()
+    title, content = extract_markdown_title(md), markdown_to_html(md)
+
+    # A copy of the template, so a stale compiled one is never measured
+    with tempfile.TemporaryDirectory() as tmp:
+        tmpl_path = os.path.join(tmp, "template.html")
+        with open(TEMPLATE_PATH, "r") as src, open(tmpl_path, "w") as dest:
+            dest.write(src.read())
+
+        results = {}
+        for name, render in [("replace", render_replace), ("compiled", render_compiled)]:
+            start = time.perf_counter()
+            for _ in range(pages):
+                render(tmpl_path, title, content)
+            results[name] = time.perf_counter() - start
+        return results
+
+
+def bench_inline(paragraphs: int) -> dict[str, float]:
+    """
+    Time inline parsing of `paragraphs` paragraphs, cycling through the
+    paragraphs of the site's content.
+    """
+    samples = []
+    for item in list_files(CONTENT_DIR, ".md"):
+        with open(os.path.join(CONTENT_DIR, item), "r") as f:
+            blocks = markdown_to_blocks(preprocess_markdown(f.read()))
+        samples.extend(block for block in blocks if block_to_block_type(block) == BlockType.PARAGRAPH)
+    texts = [samples[i % len(samples)] for i in range(paragraphs)]
+
+    results = {}
+    for name, parse in [("multipass", text_to_text_nodes_multipass), ("scanner", text_to_text_nodes)]:
+        start = time.perf_counter()
+        for text in texts:
+            parse(text)
+        results[name] = time.perf_counter() - start
+    return results
+
+
+# Name -> (function timing `count` items, what an item is)
+BENCHMARKS = {"template": (bench_template, "page"), "inline": (bench_inline, "paragraph")}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the site generator's hot paths")
+    parser.add_argument(
+        "benchmarks", nargs="*", help=f"benchmarks to run: {', '.join(BENCHMARKS)} (default: all)"
+    )
+    parser.add_argument("--count", type=int, default=5000, help="pages or paragraphs per benchmark")
+    args = parser.parse_args()
+    for name in args.benchmarks:
+        if name not in BENCHMARKS:
+            parser.error(f"unknown benchmark {name!r}")
+
+    for name in args.benchmarks or BENCHMARKS:
+        bench, unit = BENCHMARKS[name]
+        print(f"{name} ({args.count} {unit}s):")
+        results = bench(args.count)
+        baseline = next(iter(results.values()))
+        for variant, elapsed in results.items():
+            print(
+                f"{variant:>12}: {elapsed:8.3f}s {elapsed / args.count * 1e6:9.1f} us/{unit}"
+                f" {baseline / elapsed:6.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,12 @@
+import argparse
 import os
 import shutil
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
 
+from .manifest import BuildManifest
 from .markdown import extract_markdown_title, markdown_to_html
+from .template import load_template
 
 
 def recursive_copy_directory(source_dir: str, dest_dir: str) -> None:
@@ -24,6 +29,8 @@ def recursive_copy_directory(source_dir: str, dest_dir: str) -> None:
 def generate_page(md_path: str, html_tmpl_path: str, html_path: str) -> None:
     """
     Create an HTML file from a markdown file with the given HTML template file.
+
+    The template is compiled once and reused for every page, see `load_template`.
     """
     print(f"Generating page from {md_path} to {html_path} using {html_tmpl_path}")
     with open(md_path, "r") as f:
@@ -31,10 +38,7 @@ def generate_page(md_path: str, html_tmpl_path: str, html_path: str) -> None:
         title = extract_markdown_title(md)
         content = markdown_to_html(md)
 
-    with open(html_tmpl_path, "r") as f:
-        tmpl = f.read()
-
-    html = tmpl.replace("{{ Title }}", title).replace("{{ Content }}", content)
+    html = load_template(html_tmpl_path).render(Title=title, Content=content)
     with open(html_path, "w") as f:
         f.write(html)
 
@@ -65,23 +69,158 @@ def generate_pages_recursive(md_dir: str, html_tmpl_path: str, html_dir: str) ->
             )
 
 
+def generate_pages(
+    pages: list[tuple[str, str, str]], jobs: int = 1, chunk_size: int = None
+) -> None:
+    """
+    Generate pages given as `(md_path, html_tmpl_path, html_path)` tuples, in
+    `jobs` worker processes (0 for one per CPU core) that are handed
+    `chunk_size` pages at a time.
+    """
+    for _, _, html_path in pages:
+        os.makedirs(os.path.dirname(html_path), exist_ok=True)
+
+    jobs = jobs or os.cpu_count()
+    if jobs == 1 or len(pages) <= 1:
+        for page in pages:
+            generate_page(*page)
+        return
+
+    if chunk_size is None:
+        # Several chunks per worker balance uneven pages without a round trip per page
+        chunk_size = max(1, len(pages) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        # Consume the results so a failing page raises here
+        list(executor.map(generate_page, *zip(*pages), chunksize=chunk_size))
+
+
+def generate_pages_parallel(
+    md_dir: str, html_tmpl_path: str, html_dir: str, jobs: int = 0, chunk_size: int = None
+) -> None:
+    """
+    Generate the same HTML files as `generate_pages_recursive`, but collect the
+    markdown files first and render them concurrently, see `generate_pages`.
+    """
+    assert os.path.exists(md_dir)
+    os.makedirs(html_dir, exist_ok=True)
+    pages = [
+        (
+            os.path.join(md_dir, item),
+            html_tmpl_path,
+            os.path.join(html_dir, os.path.splitext(item)[0] + ".html"),
+        )
+        for item in list_files(md_dir, ".md")
+    ]
+    generate_pages(pages, jobs, chunk_size)
+
+
+def list_files(root_dir: str, ext: str = None) -> Iterator[str]:
+    """
+    Recursively yield the paths of files under a directory relative to it,
+    optionally only those with the extension `ext`.
+    """
+    with os.scandir(root_dir) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                for path in list_files(entry.path, ext):
+                    yield os.path.join(entry.name, path)
+            elif ext is None or os.path.splitext(entry.name)[1] == ext:
+                yield entry.name
+
+
+def build_incremental(
+    static_dir: str,
+    md_dir: str,
+    html_tmpl_path: str,
+    html_dir: str,
+    manifest_path: str,
+    jobs: int = 1,
+    chunk_size: int = None,
+) -> None:
+    """
+    Copy static files and generate pages like a full build, but skip outputs
+    whose sources did not change since the build recorded in the manifest and
+    delete outputs whose sources are gone. Pages are generated by `generate_pages`.
+    """
+    assert os.path.exists(static_dir)
+    assert os.path.exists(md_dir)
+    manifest = BuildManifest.load(manifest_path)
+
+    for item in list_files(static_dir):
+        source_path = os.path.join(static_dir, item)
+        dest_path = os.path.join(html_dir, item)
+        if manifest.needs_build(dest_path, [source_path]):
+            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+            shutil.copy(source_path, dest_path)
+            manifest.record(dest_path, [source_path])
+
+    pages = []
+    for item in list_files(md_dir, ".md"):
+        md_path = os.path.join(md_dir, item)
+        html_path = os.path.join(html_dir, os.path.splitext(item)[0] + ".html")
+        # Every page depends on the template as well as its markdown file
+        if manifest.needs_build(html_path, [md_path, html_tmpl_path]):
+            pages.append((md_path, html_tmpl_path, html_path))
+    generate_pages(pages, jobs, chunk_size)
+    for md_path, _, html_path in pages:
+        manifest.record(html_path, [md_path, html_tmpl_path])
+
+    for output in manifest.remove_stale(html_dir):
+        print(f"Removed {output}")
+    manifest.save()
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Generate the site from content/ into public/")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="only regenerate pages and copy static files whose sources changed since the last build",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="worker processes generating pages, 0 for one per CPU core (default: 1)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=None,
+        help="pages handed to a worker at a time (default: a quarter of each worker's share)",
+    )
+    args = parser.parse_args()
+
     project_root = os.path.split(os.path.dirname(__file__))[0]
 
     # Source files
     static_dir = os.path.join(project_root, "static/")
     assert os.path.exists(static_dir)
+    md_path = os.path.join(project_root, "content/")
+    tmpl_path = os.path.join(project_root, "template.html")
 
     # Generated files
     public_dir = os.path.join(project_root, "public/")
+    manifest_path = os.path.join(project_root, ".build-manifest.json")
+
+    if args.incremental:
+        build_incremental(
+            static_dir, md_path, tmpl_path, public_dir, manifest_path, args.jobs, args.chunk_size
+        )
+        return
+
     shutil.rmtree(public_dir, ignore_errors=True)
+    # A full build leaves no record, the next incremental build starts from scratch
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
 
     recursive_copy_directory(static_dir, public_dir)
 
     # Generate HTML
-    md_path = os.path.join(project_root, "content/")
-    tmpl_path = os.path.join(project_root, "template.html")
-    generate_pages_recursive(md_path, tmpl_path, public_dir)
+    if args.jobs == 1:
+        generate_pages_recursive(md_path, tmpl_path, public_dir)
+    else:
+        generate_pages_parallel(md_path, tmpl_path, public_dir, args.jobs, args.chunk_size)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+
+
+def file_digest(path: str) -> str:
+    """
+    Return the SHA-256 hex digest of a file's contents.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BuildManifest:
+    """
+    Records which source files every generated output was built from, so an
+    incremental build only regenerates outputs whose sources changed.
+
+    A source counts as changed when its content hash differs from the recorded one.
+    The hash is only recomputed when the size or modification time changed, so
+    checking an unchanged tree costs one `stat` per source.
+
+    Attributes:
+        path (str): The JSON file the manifest is loaded from and saved to.
+        outputs (dict): Output path -> {source path: [mtime_ns, size, sha256]}.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: str, outputs: dict[str, dict[str, list]] = None):
+        self.path = path
+        self.outputs = outputs if outputs is not None else {}
+        # Outputs checked during this build, everything else has lost its source
+        self.current = set()
+        # Source path -> [mtime_ns, size, sha256], stat'ed and hashed once per build
+        self.states = {}
+        self.recorded = {
+            source: state
+            for sources in self.outputs.values()
+            for source, state in sources.items()
+        }
+
+    @classmethod
+    def load(cls, path: str) -> "BuildManifest":
+        """
+        Load the manifest from `path`, or start an empty one if it is missing,
+        unreadable or from another manifest version.
+        """
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls(path)
+        if not isinstance(data, dict) or data.get("version") != cls.VERSION:
+            return cls(path)
+        return cls(path, data["outputs"])
+
+    def save(self) -> None:
+        """
+        Write the manifest, atomically replacing the previous one.
+        """
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"version": self.VERSION, "outputs": self.outputs}, f)
+        os.replace(tmp_path, self.path)
+
+    def source_state(self, path: str) -> list:
+        """
+        Return `[mtime_ns, size, sha256]` of a source file.
+        """
+        if path in self.states:
+            return self.states[path]
+        stat = os.stat(path)
+        recorded = self.recorded.get(path)
+        if recorded and recorded[:2] == [stat.st_mtime_ns, stat.st_size]:
+            digest = recorded[2]
+        else:
+            digest = file_digest(path)
+        state = [stat.st_mtime_ns, stat.st_size, digest]
+        self.states[path] = state
+        return state
+
+    def needs_build(self, output: str, sources: list[str]) -> bool:
+        """
+        Check whether `output` is missing or any of its `sources` changed since
+        it was recorded. Also marks `output` as part of the current build.
+        """
+        self.current.add(output)
+        recorded = self.outputs.get(output)
+        if recorded is None or set(recorded) != set(sources):
+            return True
+        if not os.path.exists(output):
+            return True
+        states = {source: self.source_state(source) for source in sources}
+        if any(states[source][2] != recorded[source][2] for source in sources):
+            return True
+        # Unchanged contents, refresh the recorded mtimes so they are not hashed again
+        self.outputs[output] = states
+        return False
+
+    def record(self, output: str, sources: list[str]) -> None:
+        """
+        Record that `output` was built from the current state of `sources`.
+        """
+        self.current.add(output)
+        self.outputs[output] = {source: self.source_state(source) for source in sources}
+
+    def remove_stale(self, output_dir: str) -> list[str]:
+        """
+        Delete the outputs recorded by earlier builds but not part of this one,
+        e.g. pages whose markdown file was deleted, along with the directories
+        under `output_dir` they leave empty. Returns the deleted outputs.
+        """
+        output_dir = os.path.abspath(output_dir)
+        stale = sorted(set(self.outputs) - self.current)
+        for output in stale:
+            del self.outputs[output]
+            if os.path.exists(output):
+                os.remove(output)
+            directory = os.path.dirname(os.path.abspath(output))
+            try:
+                while directory.startswith(output_dir + os.sep) and not os.listdir(directory):
+                    os.rmdir(directory)
+                    directory = os.path.dirname(directory)
+            except OSError:
+                pass
+        return stale
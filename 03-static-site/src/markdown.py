@@ -1,7 +1,6 @@
-import re
-
 from .htmlnode import ParentNode
 from .markdown_block import block_to_html_nodes, markdown_to_blocks
+from .patterns import TITLE_PATTERN
 
 
 def preprocess_markdown(text: str) -> str:
@@ -39,8 +38,7 @@ def extract_markdown_title(text: str) -> str:
     HTML `<title>` element can only be one per document and does not support formatting.
     """
     text = preprocess_markdown(text)
-    title_pattern = re.compile(r"^(#{1,6})\s+(.*)$", re.MULTILINE)
-    match = title_pattern.search(text)
+    match = TITLE_PATTERN.search(text)
 
     if match:
         return match.group(2).strip()
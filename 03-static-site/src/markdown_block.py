@@ -1,8 +1,17 @@
-import re
 from enum import Enum
 
 from .htmlnode import HTMLNode, ParentNode
 from .markdown_inline import text_to_html_nodes
+from .patterns import (
+    BLOCK_SEPARATOR_PATTERN,
+    CODE_FENCE_PATTERN,
+    HARD_BREAK_PATTERN,
+    HEADING_LINE_PATTERN,
+    HEADING_PATTERN,
+    ORDERED_ITEM_PATTERN,
+    QUOTE_SIGNS_PATTERN,
+    UNORDERED_ITEM_PATTERN,
+)
 from .textnode import TextNode, TextType, text_node_to_html_node
 
 
@@ -20,7 +29,7 @@ def markdown_to_blocks(text: str) -> list[str]:
     Convert a markdown text to a list of text blocks.
     """
     # Split by double newlines (with optional whitespace) to get the blocks
-    blocks = re.split(r"\n\s*\n+", text)
+    blocks = BLOCK_SEPARATOR_PATTERN.split(text)
     # Remove empty strings and strip whitespace from blocks
     return [block.strip() for block in blocks if block.strip()]
 
@@ -32,22 +41,28 @@ def block_to_block_type(block: str) -> BlockType:
     Note that this function does not strictly follow the [CommonMark](https://spec.commonmark.org/) spec,
     but rather is a simplified version that is sufficient for our purposes.
     """
-    lines = block.split("\n")
-    if re.match(r"^#{1,6}\s+", block):
+    if HEADING_PATTERN.match(block):
         return BlockType.HEADING
-    elif (match := re.match(r"^(`{3,})", block)) and block.endswith(match.group(1)):
+    if (match := CODE_FENCE_PATTERN.match(block)) and block.endswith(match.group(1)):
         return BlockType.CODE
-    # --- BOOTDEV requirement
-    # No escaping HTML
-    elif all(line.startswith(">") for line in lines):
-        return BlockType.QUOTE
-    # --- BOOTDEV requirement
-    elif all(line.startswith("- ") for line in lines):
-        return BlockType.UNORDERED_LIST
-    elif all(line.startswith(f"{i + 1}. ") for i, line in enumerate(lines)):
-        return BlockType.ORDERED_LIST
-    else:
-        return BlockType.PARAGRAPH
+
+    # Every line of a quote or list block starts with the same kind of prefix, so
+    # the first line decides the only block type the lines need to be checked for
+    # and a block starting with none of them is a paragraph without a scan.
+    if block.startswith(">"):
+        # --- BOOTDEV requirement
+        # No escaping HTML
+        if all(line.startswith(">") for line in block.split("\n")):
+            return BlockType.QUOTE
+        # --- BOOTDEV requirement
+    elif block.startswith("- "):
+        if all(line.startswith("- ") for line in block.split("\n")):
+            return BlockType.UNORDERED_LIST
+    elif block.startswith("1. "):
+        lines = block.split("\n")
+        if all(line.startswith(f"{i}. ") for i, line in enumerate(lines, 1)):
+            return BlockType.ORDERED_LIST
+    return BlockType.PARAGRAPH
 
 
 def block_to_html_nodes(block: str) -> list[HTMLNode]:
@@ -58,7 +73,7 @@ def block_to_html_nodes(block: str) -> list[HTMLNode]:
 
             # Handle the heading line (first line)
             heading_line = lines.pop(0)
-            match = re.match(r"^(#{1,6})\s+(.*)", heading_line)
+            match = HEADING_LINE_PATTERN.match(heading_line)
             hash_count = len(match.group(1))
             head_html_nodes = text_to_html_nodes(match.group(2))
             html_nodes.append(ParentNode(f"h{str(hash_count)}", head_html_nodes))
@@ -70,7 +85,7 @@ def block_to_html_nodes(block: str) -> list[HTMLNode]:
 
         case BlockType.CODE:
             # Remove the backticks
-            backticks = re.match(r"^(`{3,})", block)
+            backticks = CODE_FENCE_PATTERN.match(block)
             backticks_count = len(backticks.group(1))
             content = block[backticks_count:-backticks_count].strip()
             # Convert to HTML node without any inline parsing
@@ -86,7 +101,7 @@ def block_to_html_nodes(block: str) -> list[HTMLNode]:
                 # Remove '>' every lines
                 # --- BOOTDEV requirement
                 # No escaping HTML
-                signs = re.match(r"^(>+\s*)", line)
+                signs = QUOTE_SIGNS_PATTERN.match(line)
                 # --- BOOTDEV requirement
                 signs_char_len = len(signs.group(1))
                 line = line[signs_char_len:]
@@ -111,10 +126,10 @@ def block_to_html_nodes(block: str) -> list[HTMLNode]:
 
 def block_list_to_html_nodes(block: str, ordered: bool) -> list[HTMLNode]:
     content_nodes = []
-    pattern = r"^(\d+. )" if ordered else r"^(- )"
+    pattern = ORDERED_ITEM_PATTERN if ordered else UNORDERED_ITEM_PATTERN
     for line in block.split("\n"):
         # Remove the pattern
-        signs = re.match(pattern, line)
+        signs = pattern.match(line)
         line = line[len(signs.group(1)) :]
         # --- BOOTDEV requirement
         # Generally the content of list is under paragraph,
@@ -134,7 +149,7 @@ def block_paragraph_to_html_nodes(block: str) -> list[HTMLNode]:
 
     for line in lines:
         # CommonMark 0.31.2 ex226: hard line break
-        line = re.sub(r"\s{2,}$", "<br />", line)
+        line = HARD_BREAK_PATTERN.sub("<br />", line)
         content_nodes.extend(text_to_html_nodes(line))
 
     return [ParentNode("p", content_nodes)]
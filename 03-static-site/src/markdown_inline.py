@@ -1,9 +1,8 @@
 # For simplicity's sake, currently we don't care about nested inline elements.
 # For example, `This is an _italic and **bold** word_.` is not supported.
 
-import re
-
 from .htmlnode import HTMLNode
+from .patterns import IMAGE_PATTERN, INLINE_TOKEN_PATTERN, LINK_PATTERN
 from .textnode import TextNode, TextType, text_node_to_html_node
 
 
@@ -14,9 +13,71 @@ def text_to_html_nodes(text: str) -> list[HTMLNode]:
     return list(map(text_node_to_html_node, text_to_text_nodes(text)))
 
 
+# Delimiters of the inline elements, longest first so `**` is not read as two `*`
+INLINE_DELIMITERS = {
+    "**": TextType.BOLD,
+    "__": TextType.BOLD,
+    "`": TextType.CODE,
+    "*": TextType.ITALIC,
+    "_": TextType.ITALIC,
+}
+# Characters a delimiter can start with, see `text_to_text_nodes`
+DELIMITER_CHARS = frozenset("*_`")
+
+
 def text_to_text_nodes(text: str) -> list[TextNode]:
     """
     Convert a string to a list of `TextNode` objects.
+
+    This is a single left-to-right scan producing the same nodes as the passes of
+    `text_to_text_nodes_multipass` for any text those accept: delimiters pair with
+    the next occurrence of themselves, and images and links are only recognized
+    when no delimiter was split inside of them, as the passes split delimiters first.
+    Some text the passes reject, e.g. a `**` inside a code span, is accepted.
+    """
+    nodes = []
+    # Start of the pending text node and where to look for the next token
+    start = pos = 0
+    while True:
+        token = INLINE_TOKEN_PATTERN.search(text, pos)
+        if token is None:
+            break
+
+        delimiter = token.group()
+        if delimiter in INLINE_DELIMITERS:
+            end = text.find(delimiter, token.end())
+            if end == -1:
+                raise Exception("Invalid Markdown syntax: no matching delimiter found")
+            if token.start() > start:
+                nodes.append(TextNode(text[start : token.start()], TextType.TEXT))
+            # Empty elements are dropped, but still end the text node before them
+            if end > token.end():
+                nodes.append(TextNode(text[token.end() : end], INLINE_DELIMITERS[delimiter]))
+            start = pos = end + len(delimiter)
+            continue
+
+        if delimiter == "[":
+            match, text_type = LINK_PATTERN.match(text, token.start()), TextType.LINK
+        else:
+            match, text_type = IMAGE_PATTERN.match(text, token.start()), TextType.IMAGE
+        if match is None or not DELIMITER_CHARS.isdisjoint(match.group()):
+            # Not an image or link, the `[` of a `![` may still start a link
+            pos = token.start() + 1
+            continue
+        if token.start() > start:
+            nodes.append(TextNode(text[start : token.start()], TextType.TEXT))
+        nodes.append(TextNode(match.group(1), text_type, match.group(2)))
+        start = pos = match.end()
+
+    if start < len(text):
+        nodes.append(TextNode(text[start:], TextType.TEXT))
+    return nodes
+
+
+def text_to_text_nodes_multipass(text: str) -> list[TextNode]:
+    """
+    Convert a string to a list of `TextNode` objects with one pass over the nodes
+    per delimiter and for images and links. The reference for `text_to_text_nodes`.
     """
     # Order of operations is important, we want to split for the longest delimiters first
     nodes = [TextNode(text, TextType.TEXT)]
@@ -92,13 +153,7 @@ def extract_markdown_images(text: str) -> list[tuple[str, str]]:
     # [("alt text", "https://example.com/image.png")]
     ```
     """
-    # Pattern explanation:
-    # ! - literal exclamation mark
-    # [...] - alt text between square brackets, no nested brackets allowed
-    # (...) - URL between parentheses, no nested parentheses allowed
-    alt_text_pattern = r"\[([^\[\]]*)\]"  # captures text between []
-    url_pattern = r"\(([^\(\)]*)\)"  # captures text between ()
-    return re.findall(f"!{alt_text_pattern}{url_pattern}", text)
+    return IMAGE_PATTERN.findall(text)
 
 
 def split_nodes_image(old_nodes: list[TextNode]) -> list[TextNode]:
@@ -158,14 +213,7 @@ def extract_markdown_links(text: str) -> list[tuple[str, str]]:
     # [("link", "https://example.com")]
     ```
     """
-    # Pattern explanation:
-    # (?<!!) - negative lookbehind to ensure not preceded by ! (to exclude images)
-    # [...] - anchor text between square brackets, no nested brackets allowed
-    # (...) - URL between parentheses, no nested parentheses allowed
-    anchor_text_pattern = r"\[([^\[\]]*)\]"  # captures text between []
-    url_pattern = r"\(([^\(\)]*)\)"  # captures text between ()
-    negative_lookbehind = r"(?<!!)"  # ensure not preceded by !
-    return re.findall(f"{negative_lookbehind}{anchor_text_pattern}{url_pattern}", text)
+    return LINK_PATTERN.findall(text)
 
 
 def split_nodes_link(old_nodes: list[TextNode]) -> list[TextNode]:
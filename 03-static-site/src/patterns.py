@@ -0,0 +1,39 @@
+# Regular expressions of the markdown parser, compiled once at import instead of
+# being looked up (or composed from f-strings) on every call.
+
+import re
+
+# --- Blocks
+
+# Blank lines (with optional whitespace) between blocks
+BLOCK_SEPARATOR_PATTERN = re.compile(r"\n\s*\n+")
+# Hashes of a heading block
+HEADING_PATTERN = re.compile(r"^#{1,6}\s+")
+# Hashes and text of a heading line
+HEADING_LINE_PATTERN = re.compile(r"^(#{1,6})\s+(.*)")
+# Any heading line of a whole document, for the title
+TITLE_PATTERN = re.compile(r"^(#{1,6})\s+(.*)$", re.MULTILINE)
+# Opening backticks of a code block, the closing ones must be the same
+CODE_FENCE_PATTERN = re.compile(r"^(`{3,})")
+# Signs at the start of a quote line
+QUOTE_SIGNS_PATTERN = re.compile(r"^(>+\s*)")
+# Marker at the start of a list item
+UNORDERED_ITEM_PATTERN = re.compile(r"^(- )")
+ORDERED_ITEM_PATTERN = re.compile(r"^(\d+\. )")
+# Trailing whitespace making a hard line break
+HARD_BREAK_PATTERN = re.compile(r"\s{2,}$")
+
+# --- Inline
+
+# Where the next inline element may start: a delimiter, an image or a link
+INLINE_TOKEN_PATTERN = re.compile(r"\*\*|__|`|\*|_|!?\[")
+# Pattern explanation:
+# ! - literal exclamation mark
+# [...] - alt text between square brackets, no nested brackets allowed
+# (...) - URL between parentheses, no nested parentheses allowed
+IMAGE_PATTERN = re.compile(r"!\[([^\[\]]*)\]\(([^\(\)]*)\)")
+# Pattern explanation:
+# (?<!!) - negative lookbehind to ensure not preceded by ! (to exclude images)
+# [...] - anchor text between square brackets, no nested brackets allowed
+# (...) - URL between parentheses, no nested parentheses allowed
+LINK_PATTERN = re.compile(r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)")
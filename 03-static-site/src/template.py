@@ -0,0 +1,66 @@
+import os
+import re
+
+PLACEHOLDER_PATTERN = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+
+class Template:
+    """
+    An HTML template compiled once into literal segments and placeholder slots.
+
+    Placeholders are written `{{ Name }}`. Rendering fills every slot in a single
+    `str.join` instead of one `str.replace` pass over the whole template per
+    placeholder. Placeholders without a value are kept as they are written.
+
+    Attributes:
+        parts (list[str]): Literal segments, with the placeholders' original text at the slots.
+        slots (list[tuple[int, str]]): Index into `parts` and name of each placeholder.
+    """
+
+    def __init__(self, text: str):
+        self.parts = []
+        self.slots = []
+        start = 0
+        for match in PLACEHOLDER_PATTERN.finditer(text):
+            self.parts.append(text[start : match.start()])
+            self.slots.append((len(self.parts), match.group(1)))
+            self.parts.append(match.group(0))
+            start = match.end()
+        self.parts.append(text[start:])
+
+    def __repr__(self) -> str:
+        return f"Template({[name for _, name in self.slots]})"
+
+    @property
+    def placeholders(self) -> set[str]:
+        return {name for _, name in self.slots}
+
+    def render(self, **values: str) -> str:
+        """
+        Return the template with its placeholders replaced by `values`.
+        """
+        parts = self.parts.copy()
+        for index, name in self.slots:
+            if name in values:
+                parts[index] = values[name]
+        return "".join(parts)
+
+
+# Template path -> (modification time, compiled template), per process
+_templates: dict[str, tuple[int, Template]] = {}
+
+
+def load_template(path: str) -> Template:
+    """
+    Read and compile the template file at `path`, reusing the compiled template
+    for as long as the file is not modified.
+    """
+    mtime = os.stat(path).st_mtime_ns
+    cached = _templates.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    with open(path, "r") as f:
+        template = Template(f.read())
+    _templates[path] = (mtime, template)
+    return template
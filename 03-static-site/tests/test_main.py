@@ -0,0 +1,53 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from src.main import generate_pages_parallel, generate_pages_recursive, list_files
+
+
+class TestGeneratePages(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = lambda *parts: os.path.join(self.tmp.name, *parts)
+        for name in ["index.md", "blog/index.md", "blog/post/index.md", "notes.md"]:
+            path = self.path("content", name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write(f"# {name}\n\nSome **text** in {name}")
+        with open(self.path("content", "blog", "image.png"), "w") as f:
+            f.write("not markdown")
+        with open(self.path("template.html"), "w") as f:
+            f.write("<title>{{ Title }}</title>{{ Content }}")
+
+    def read_tree(self, root: str) -> dict[str, str]:
+        tree = {}
+        for item in list_files(root):
+            with open(os.path.join(root, item)) as f:
+                tree[item] = f.read()
+        return tree
+
+    def test_list_files(self):
+        self.assertEqual(
+            sorted(list_files(self.path("content"), ".md")),
+            ["blog/index.md", "blog/post/index.md", "index.md", "notes.md"],
+        )
+        self.assertEqual(len(list(list_files(self.path("content")))), 5)
+
+    def test_parallel_matches_recursive(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_pages_recursive(
+                self.path("content"), self.path("template.html"), self.path("serial")
+            )
+            generate_pages_parallel(
+                self.path("content"), self.path("template.html"), self.path("parallel"), 2, 1
+            )
+        serial = self.read_tree(self.path("serial"))
+        self.assertEqual(len(serial), 4)
+        self.assertEqual(self.read_tree(self.path("parallel")), serial)
+
+
+if __name__ == "__main__":
+    unittest.main()
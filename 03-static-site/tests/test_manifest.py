@@ -0,0 +1,146 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from src.main import build_incremental
+from src.manifest import BuildManifest
+
+
+def write_file(path: str, text: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+
+class TestBuildManifest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = self.tmp.name
+        self.source = os.path.join(self.root, "page.md")
+        self.output = os.path.join(self.root, "out", "page.html")
+        self.manifest_path = os.path.join(self.root, "manifest.json")
+        write_file(self.source, "# Page")
+
+    def build(self) -> bool:
+        """
+        Run one build of the single output against a freshly loaded manifest.
+        """
+        manifest = BuildManifest.load(self.manifest_path)
+        built = manifest.needs_build(self.output, [self.source])
+        if built:
+            write_file(self.output, "built")
+            manifest.record(self.output, [self.source])
+        manifest.remove_stale(self.root)
+        manifest.save()
+        return built
+
+    def test_first_build(self):
+        self.assertTrue(self.build())
+
+    def test_unchanged(self):
+        self.build()
+        self.assertFalse(self.build())
+
+    def test_touched_but_unchanged(self):
+        self.build()
+        stat = os.stat(self.source)
+        os.utime(self.source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertFalse(self.build())
+
+    def test_changed(self):
+        self.build()
+        write_file(self.source, "# Changed page")
+        self.assertTrue(self.build())
+
+    def test_output_deleted(self):
+        self.build()
+        os.remove(self.output)
+        self.assertTrue(self.build())
+
+    def test_sources_changed(self):
+        self.build()
+        manifest = BuildManifest.load(self.manifest_path)
+        self.assertTrue(manifest.needs_build(self.output, [self.source, self.manifest_path]))
+
+    def test_remove_stale(self):
+        self.build()
+        manifest = BuildManifest.load(self.manifest_path)
+        self.assertEqual(manifest.remove_stale(self.root), [self.output])
+        self.assertFalse(os.path.exists(self.output))
+        self.assertFalse(os.path.exists(os.path.dirname(self.output)))
+        self.assertEqual(manifest.outputs, {})
+
+    def test_corrupt_manifest(self):
+        write_file(self.manifest_path, "{not json")
+        self.assertEqual(BuildManifest.load(self.manifest_path).outputs, {})
+
+
+class TestBuildIncremental(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = lambda *parts: os.path.join(self.tmp.name, *parts)
+        write_file(self.path("static", "index.css"), "body {}")
+        write_file(self.path("content", "index.md"), "# Home\n\nWelcome")
+        write_file(self.path("content", "blog", "index.md"), "# Blog\n\nPosts")
+        write_file(self.path("template.html"), "<title>{{ Title }}</title>{{ Content }}")
+
+    def build(self) -> str:
+        """
+        Run an incremental build and return what it printed.
+        """
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            build_incremental(
+                self.path("static"),
+                self.path("content"),
+                self.path("template.html"),
+                self.path("public"),
+                self.path("manifest.json"),
+            )
+        return out.getvalue()
+
+    def read(self, *parts: str) -> str:
+        with open(self.path(*parts)) as f:
+            return f.read()
+
+    def test_full_then_nothing(self):
+        self.assertEqual(self.build().count("Generating page"), 2)
+        self.assertEqual(self.read("public", "index.css"), "body {}")
+        self.assertEqual(
+            self.read("public", "blog", "index.html"),
+            "<title>Blog</title><div><h1>Blog</h1><p>Posts</p></div>",
+        )
+        self.assertEqual(self.build(), "")
+
+    def test_changed_page(self):
+        self.build()
+        write_file(self.path("content", "index.md"), "# Home\n\nChanged")
+        self.assertEqual(self.build().count("Generating page"), 1)
+        self.assertIn("Changed", self.read("public", "index.html"))
+
+    def test_changed_template(self):
+        self.build()
+        write_file(self.path("template.html"), "{{ Content }}")
+        self.assertEqual(self.build().count("Generating page"), 2)
+        self.assertEqual(self.read("public", "index.html"), "<div><h1>Home</h1><p>Welcome</p></div>")
+
+    def test_changed_static(self):
+        self.build()
+        write_file(self.path("static", "index.css"), "p {}")
+        self.assertEqual(self.build(), "")
+        self.assertEqual(self.read("public", "index.css"), "p {}")
+
+    def test_deleted_page(self):
+        self.build()
+        os.remove(self.path("content", "blog", "index.md"))
+        self.assertIn("Removed", self.build())
+        self.assertFalse(os.path.exists(self.path("public", "blog")))
+        self.assertTrue(os.path.exists(self.path("public", "index.html")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -182,6 +182,23 @@ so this is wrong
 """
         self.assertEqual(self.process(md), [BlockType.PARAGRAPH] * 3)
 
+    # Mixed line prefixes
+    def test_mixed_prefixes(self):
+        md = """
+> quote line
+- then a list item
+
+- list item
+> then a quote line
+
+1. ordered item
+- then an unordered one
+
+- unordered item
+1. then an ordered one
+"""
+        self.assertEqual(self.process(md), [BlockType.PARAGRAPH] * 4)
+
     # Paragraph tests
     def test_paragraph_correct(self):
         md = """
@@ -7,6 +7,7 @@ from src.markdown_inline import (
     split_nodes_image,
     split_nodes_link,
     text_to_text_nodes,
+    text_to_text_nodes_multipass,
 )
 from src.textnode import TextNode, TextType
 
@@ -374,6 +375,57 @@ class TestTextToTextNodes(unittest.TestCase):
         ]
         self.assertEqual(result, expected)
 
+    def test_text_to_textnodes_adjacent_and_empty(self):
+        text = "a****b``c **d**_e_"
+        expected = [
+            TextNode("a", TextType.TEXT),
+            TextNode("b", TextType.TEXT),
+            TextNode("c ", TextType.TEXT),
+            TextNode("d", TextType.BOLD),
+            TextNode("e", TextType.ITALIC),
+        ]
+        self.assertEqual(text_to_text_nodes(text), expected)
+
+    def test_text_to_textnodes_delimiter_inside_link(self):
+        # Delimiters are split before links are recognized
+        text = "[a_b](url_c) and [link](url)"
+        expected = [
+            TextNode("[a", TextType.TEXT),
+            TextNode("b](url", TextType.ITALIC),
+            TextNode("c) and ", TextType.TEXT),
+            TextNode("link", TextType.LINK, "url"),
+        ]
+        self.assertEqual(text_to_text_nodes(text), expected)
+
+    def test_text_to_textnodes_not_image(self):
+        text = "!![alt](img) and ![not an image] [link](url)"
+        expected = [
+            TextNode("!", TextType.TEXT),
+            TextNode("alt", TextType.IMAGE, "img"),
+            TextNode(" and ![not an image] ", TextType.TEXT),
+            TextNode("link", TextType.LINK, "url"),
+        ]
+        self.assertEqual(text_to_text_nodes(text), expected)
+
+    def test_text_to_textnodes_unmatched_raises(self):
+        with self.assertRaises(Exception):
+            text_to_text_nodes("This is **unmatched bold")
+
+    def test_text_to_textnodes_matches_multipass(self):
+        texts = [
+            "",
+            "plain",
+            "**a*b** *c*",
+            "a *** b** c",
+            "`code with * and _` then *it* and __b__",
+            "![](img)[](url)![a](b)",
+            "[x](y)![z](w) **[not](link)**",
+            "_a_ **b** `c` *d* __e__ [f](g) ![h](i)",
+        ]
+        for text in texts:
+            with self.subTest(text=text):
+                self.assertEqual(text_to_text_nodes(text), text_to_text_nodes_multipass(text))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+
+from src.template import Template, load_template
+
+
+class TestTemplate(unittest.TestCase):
+    def test_render(self):
+        tmpl = Template("<title>{{ Title }}</title><article>{{ Content }}</article>")
+        self.assertEqual(
+            tmpl.render(Title="Hello", Content="<p>World</p>"),
+            "<title>Hello</title><article><p>World</p></article>",
+        )
+
+    def test_placeholders(self):
+        tmpl = Template("{{ Title }} {{Date}} {{  Title  }}")
+        self.assertEqual(tmpl.placeholders, {"Title", "Date"})
+        self.assertEqual(tmpl.render(Title="a", Date="b"), "a b a")
+
+    def test_missing_value_kept(self):
+        tmpl = Template("<p>{{ Title }}</p><p>{{ Author }}</p>")
+        self.assertEqual(tmpl.render(Title="x"), "<p>x</p><p>{{ Author }}</p>")
+
+    def test_no_placeholders(self):
+        self.assertEqual(Template("").render(Title="x"), "")
+        self.assertEqual(Template("{ Title }").render(Title="x"), "{ Title }")
+
+    def test_values_not_rescanned(self):
+        tmpl = Template("{{ Title }}|{{ Content }}")
+        self.assertEqual(tmpl.render(Title="{{ Content }}", Content="c"), "{{ Content }}|c")
+
+
+class TestLoadTemplate(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "template.html")
+        self.write("<h1>{{ Title }}</h1>")
+
+    def write(self, text: str) -> None:
+        with open(self.path, "w") as f:
+            f.write(text)
+
+    def test_cached(self):
+        self.assertIs(load_template(self.path), load_template(self.path))
+
+    def test_reloaded_when_modified(self):
+        first = load_template(self.path)
+        self.write("<h2>{{ Title }}</h2>")
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertIsNot(load_template(self.path), first)
+        self.assertEqual(load_template(self.path).render(Title="x"), "<h2>x</h2>")
+
+
+if __name__ == "__main__":
+    unittest.main()